@@ -0,0 +1,40 @@
+from typing import Optional
+
+from authentication.models import User
+from authentication.services import (
+    get_cached_user,
+)
+from django.utils.translation import (
+    gettext_lazy as _,
+)
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+)
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import (
+    api_settings,
+)
+from rest_framework_simplejwt.tokens import Token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    authentication by the access token with the user and the profile
+    served from the cache, invalidated by the changes of the user
+    """
+
+    def get_user(self, validated_token: Token) -> User:
+        try:
+            user_id: int = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user: Optional[User] = get_cached_user(user_id=user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
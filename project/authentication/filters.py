@@ -1,21 +1,22 @@
-import itertools
-from typing import Any
+from datetime import date
+from typing import Any, Optional, Union
 
 from authentication.models import User
+from dateutil.relativedelta import relativedelta
 from django.contrib.postgres.search import (
     TrigramSimilarity,
 )
-from django.db.models import (
-    FloatField,
-    TextField,
-    Value,
-)
-from django.db.models.functions import Concat
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Greatest
 from django.db.models.query import QuerySet
+from django.utils import timezone
 from django_filters import (
     rest_framework as filters,
 )
-from rest_framework.filters import SearchFilter
+from rest_framework.filters import (
+    OrderingFilter,
+    SearchFilter,
+)
 from rest_framework.request import Request
 
 
@@ -30,23 +31,27 @@ class RankedFuzzySearchFilter(MySearchFilter):
     def search_queryset(
         queryset: QuerySet[Any], search_fields: tuple[str], search_terms, min_rank
     ) -> QuerySet[Any]:
-        full_text_vector: tuple = sum(
-            itertools.zip_longest(search_fields, (), fillvalue=Value(" ")), ()
+        """
+        the rows are matched by the trigram % operator, so the gin_trgm_ops
+        indexes of the search fields are used, and only the matched rows
+        are ranked by the similarity
+        """
+        matches: Q = Q()
+        for field in search_fields:
+            matches |= Q(**{f"{field}__trigram_similar": search_terms})
+
+        similarities: list[TrigramSimilarity] = [
+            TrigramSimilarity(field, search_terms) for field in search_fields
+        ]
+        similarity: Union[TrigramSimilarity, Greatest] = (
+            Greatest(*similarities) if len(similarities) > 1 else similarities[0]
         )
-        if len(search_fields) > 1:
-            full_text_vector = full_text_vector[:-1]
-
-        full_text_expr: Concat = Concat(*full_text_vector, output_field=TextField())
+        queryset: QuerySet[Any] = queryset.filter(matches).annotate(rank=similarity)
 
-        similarity: TrigramSimilarity = TrigramSimilarity(full_text_expr, search_terms)
-        queryset: QuerySet[Any] = queryset.annotate(rank=similarity)
-
-        if min_rank is None:
-            queryset = queryset.filter(rank__gt=0.0)
-        elif min_rank > 0.0:
+        if min_rank is not None and min_rank > 0.0:
             queryset = queryset.filter(rank__gte=min_rank)
 
-        return queryset[:5]
+        return queryset.order_by("-rank")[:5]
 
     def filter_queryset(
         self, request: Request, queryset: QuerySet[Any], view
@@ -68,8 +73,44 @@ class RankedFuzzySearchFilter(MySearchFilter):
         return queryset[:5]
 
 
+class UserOrderingFilter(OrderingFilter):
+    # the age is not stored, the users are ordered by the birthday instead
+    AGE_ORDERING: dict[str, str] = {
+        "profile__age": "-profile__birthday",
+        "-profile__age": "profile__birthday",
+    }
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet[Any], view
+    ) -> Optional[list[str]]:
+        ordering: Optional[list[str]] = super().get_ordering(request, queryset, view)
+        if ordering is None:
+            return ordering
+        return [self.AGE_ORDERING.get(field, field) for field in ordering]
+
+
 class UserAgeRangeFilter(filters.FilterSet):
-    profile__age = filters.RangeFilter()
+    profile__age = filters.RangeFilter(method="filter_age")
+
+    def filter_age(
+        self, queryset: QuerySet[User], name: str, value: slice
+    ) -> QuerySet[User]:
+        """
+        the range of the ages is translated to the range of the birthdays:
+        the age is at least N when the birthday is not later than the
+        date N years ago, and at most N when the birthday is later
+        than the date N + 1 years ago
+        """
+        today: date = timezone.now().date()
+        if value.start is not None:
+            queryset = queryset.filter(
+                profile__birthday__lte=today - relativedelta(years=int(value.start))
+            )
+        if value.stop is not None:
+            queryset = queryset.filter(
+                profile__birthday__gt=today - relativedelta(years=int(value.stop) + 1)
+            )
+        return queryset
 
     class Meta:
         model: User = User
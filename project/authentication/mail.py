@@ -0,0 +1,98 @@
+import smtplib
+from typing import Any, Optional
+
+from authentication.constant.success import (
+    BLANBALL,
+)
+from celery.signals import worker_process_shutdown
+from django.core.mail import (
+    EmailMessage,
+    get_connection,
+)
+from django.core.mail.backends.base import (
+    BaseEmailBackend,
+)
+
+# the smtp errors after which the message can be sent again later
+TRANSIENT_EMAIL_ERRORS: tuple[type[Exception], ...] = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+
+_connection: Optional[BaseEmailBackend] = None
+
+
+def get_email_connection() -> BaseEmailBackend:
+    """
+    the connection to the smtp server is opened once
+    per worker process and reused by the next batches
+    """
+    global _connection
+    if _connection is None:
+        _connection = get_connection()
+    _connection.open()
+    return _connection
+
+
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs: Any) -> None:
+    global _connection
+    if _connection is not None:
+        try:
+            _connection.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _connection = None
+
+
+def is_transient_email_error(error: Exception) -> bool:
+    if isinstance(error, TRANSIENT_EMAIL_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code < 500
+    return False
+
+
+def build_email_message(*, data: dict[str, str]) -> EmailMessage:
+    message: EmailMessage = EmailMessage(
+        subject=BLANBALL, body=data["email_body"], to=[data["to_email"]]
+    )
+    message.content_subtype = "html"
+    return message
+
+
+def send_email_messages(
+    messages: list[dict[str, str]]
+) -> tuple[list[dict[str, Any]], list[dict[str, str]]]:
+    """
+    sending of the messages over the pooled connection, returns the
+    outcome of every sent or rejected message and the messages that
+    failed with the transient errors and can be sent again later, a
+    dropped connection is reopened once for the message
+    """
+    outcomes: list[dict[str, Any]] = []
+    for index, data in enumerate(messages):
+        message: EmailMessage = build_email_message(data=data)
+        for reconnect in (True, False):
+            try:
+                get_email_connection().send_messages([message])
+                outcomes.append({"to_email": data["to_email"], "success": True})
+                break
+            except (smtplib.SMTPException, OSError) as error:
+                if not is_transient_email_error(error):
+                    outcomes.append(
+                        {
+                            "to_email": data["to_email"],
+                            "success": False,
+                            "error": str(error),
+                        }
+                    )
+                    break
+                close_email_connection()
+                if not reconnect:
+                    return outcomes, messages[index:]
+    return outcomes, []
@@ -6,6 +6,9 @@ from typing import Any, Union
 import django
 import jwt
 from authentication.models import User
+from authentication.services import (
+    get_cached_user,
+)
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.conf import settings
@@ -24,19 +27,15 @@ def get_user(token: str) -> Union[AnonymousUser, User]:
         payload: dict[str, Any] = jwt.decode(
             token, settings.SECRET_KEY, algorithms=settings.ALGORITHM
         )
-    except User.DoesNotExist:
+    except jwt.PyJWTError:
         return AnonymousUser()
 
     token_exp: datetime = datetime.fromtimestamp(payload["exp"])
     if token_exp < datetime.utcnow():
         return AnonymousUser()
 
-    try:
-        user: User = User.objects.get(id=payload["user_id"])
-    except User.DoesNotExist:
-        return AnonymousUser()
-
-    return user
+    # the handshakes of the known users do not touch the database
+    return get_cached_user(user_id=payload["user_id"]) or AnonymousUser()
 
 
 class TokenAuthMiddleware(BaseMiddleware):
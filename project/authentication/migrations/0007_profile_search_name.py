@@ -0,0 +1,35 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+
+def fill_profiles_search_name(apps, schema_editor) -> None:
+    Profile = apps.get_model("authentication", "Profile")
+    Profile.objects.update(search_name=Concat("name", Value(" "), "last_name"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0006_alter_profile_avatar"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="search_name",
+            field=models.CharField(default="", max_length=511),
+        ),
+        migrations.RunPython(fill_profiles_search_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_name"],
+                name="profile_search_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0007_profile_search_name"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="code",
+            name="life_time",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="code",
+            index=models.Index(
+                fields=["user_email", "type"], name="code_user_email_type_idx"
+            ),
+        ),
+    ]
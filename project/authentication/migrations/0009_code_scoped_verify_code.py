@@ -0,0 +1,58 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:36
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def delete_replaced_codes(apps, schema_editor) -> None:
+    Code = apps.get_model("authentication", "Code")
+    Code.objects.filter(
+        Exists(
+            Code.objects.filter(
+                user_email=OuterRef("user_email"),
+                type=OuterRef("type"),
+                id__gt=OuterRef("id"),
+            )
+        )
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0008_code_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_replaced_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name="code",
+            name="code_user_email_type_idx",
+        ),
+        migrations.AlterField(
+            model_name="code",
+            name="verify_code",
+            field=models.CharField(max_length=5),
+        ),
+        migrations.AddConstraint(
+            model_name="code",
+            constraint=models.UniqueConstraint(
+                fields=("user_email", "type"), name="code_user_email_type_unique"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="code",
+            constraint=models.UniqueConstraint(
+                fields=("user_email", "verify_code"),
+                name="code_user_email_verify_code_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="code",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("type", "password_reset")),
+                fields=("verify_code",),
+                name="code_password_reset_verify_code_unique",
+            ),
+        ),
+    ]
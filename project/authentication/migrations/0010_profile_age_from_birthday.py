@@ -0,0 +1,27 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:40
+
+import authentication.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0009_code_scoped_verify_code"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="profile",
+            name="age",
+        ),
+        migrations.AlterField(
+            model_name="profile",
+            name="birthday",
+            field=models.DateField(
+                db_index=True,
+                null=True,
+                validators=[authentication.models.validate_birthday],
+            ),
+        ),
+    ]
@@ -1,7 +1,10 @@
 import os
 from datetime import date, datetime
-from typing import Any, final
+from typing import Any, Optional, final
 
+from authentication.constant.code_types import (
+    PASSWORD_RESET_CODE_TYPE,
+)
 from authentication.constant.errors import (
     MAX_AGE_VALUE_ERROR,
     MIN_AGE_VALUE_ERROR,
@@ -11,11 +14,16 @@ from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
 )
+from django.contrib.postgres.indexes import (
+    GinIndex,
+)
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
 )
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
 from django.db.models.query import QuerySet
 from django.utils import timezone
 from django.utils.encoding import smart_bytes
@@ -117,11 +125,12 @@ class Profile(models.Model):
     name: str = models.CharField(max_length=255)
     last_name: str = models.CharField(max_length=255)
     gender: str = models.CharField(choices=Gender.choices, max_length=10)
-    birthday: date = models.DateField(null=True, validators=[validate_birthday])
+    birthday: date = models.DateField(
+        null=True, db_index=True, validators=[validate_birthday]
+    )
     avatar: Image = models.ImageField(
         null=True, upload_to=image_file_name, validators=[validate_image]
     )
-    age: int = models.PositiveSmallIntegerField(null=True)
     height: int = models.PositiveSmallIntegerField(
         null=True,
         validators=[
@@ -141,6 +150,8 @@ class Profile(models.Model):
     )
     created_at: datetime = models.DateTimeField(auto_now_add=True)
     about_me: str = models.TextField(null=True)
+    # stored search document for the trigram search by name and last name
+    search_name: str = models.CharField(max_length=511, default="")
 
     @final
     def __repr__(self) -> str:
@@ -150,8 +161,35 @@ class Profile(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def age(self) -> Optional[int]:
+        """the full years from the birthday, the queries use the birthday"""
+        if self.birthday is None:
+            return None
+        today: date = timezone.now().date()
+        return (
+            today.year
+            - self.birthday.year
+            - ((today.month, today.day) < (self.birthday.month, self.birthday.day))
+        )
+
+    @final
+    @staticmethod
+    def get_search_name(data: dict[str, Any]) -> Concat:
+        """
+        search document expression for the update of the
+        profiles, with the new name or last name from the data
+        """
+        return Concat(
+            Value(data["name"]) if "name" in data else F("name"),
+            Value(" "),
+            Value(data["last_name"]) if "last_name" in data else F("last_name"),
+            output_field=models.CharField(),
+        )
+
     @final
     def save(self, *args: Any, **kwargs: Any) -> None:
+        self.search_name = f"{self.name} {self.last_name}"
         super(Profile, self).save(*args, **kwargs)
         if self.avatar != None:
             client: Minio = Minio(
@@ -173,6 +211,13 @@ class Profile(models.Model):
         db_table: str = "profile"
         verbose_name: str = "profile"
         verbose_name_plural: str = "profiles"
+        indexes = [
+            GinIndex(
+                name="profile_search_name_trgm_idx",
+                fields=["search_name"],
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
 
 class User(AbstractBaseUser):
@@ -225,8 +270,8 @@ class User(AbstractBaseUser):
 
 
 class Code(models.Model):
-    verify_code: str = models.CharField(max_length=5, unique=True)
-    life_time: datetime = models.DateTimeField(null=True)
+    verify_code: str = models.CharField(max_length=5)
+    life_time: datetime = models.DateTimeField(null=True, db_index=True)
     type: str = models.CharField(max_length=20)
     user_email: str = models.CharField(max_length=255)
     dop_info: str = models.CharField(max_length=255, null=True)
@@ -239,7 +284,29 @@ class Code(models.Model):
     def __str__(self) -> str:
         return self.verify_code
 
+    @final
+    @staticmethod
+    def get_valid() -> QuerySet["Code"]:
+        return Code.objects.filter(life_time__gt=timezone.now())
+
     class Meta:
         db_table: str = "code"
         verbose_name: str = "code"
         verbose_name_plural: str = "codes"
+        constraints = [
+            # the code replaces the code of the same type sent to the email before
+            models.UniqueConstraint(
+                name="code_user_email_type_unique", fields=["user_email", "type"]
+            ),
+            # the codes of the authorized users are looked up by the email
+            models.UniqueConstraint(
+                name="code_user_email_verify_code_unique",
+                fields=["user_email", "verify_code"],
+            ),
+            # the password reset codes are sent without the authorization
+            models.UniqueConstraint(
+                name="code_password_reset_verify_code_unique",
+                fields=["verify_code"],
+                condition=models.Q(type=PASSWORD_RESET_CODE_TYPE),
+            ),
+        ]
@@ -0,0 +1,76 @@
+from typing import Iterable
+
+from authentication.models import User
+from django.core.cache import cache
+
+# the user is offline when no connection sent a heartbeat for this time
+PRESENCE_TIMEOUT: int = 90
+# the heartbeat of an open connection, sent by the server
+PRESENCE_REFRESH_INTERVAL: int = 30
+PRESENCE_SYNC_BATCH_SIZE: int = 1000
+
+
+def presence_key(user_id: int) -> str:
+    return "presence_%s" % user_id
+
+
+def presence_connections_key(user_id: int) -> str:
+    return "presence_connections_%s" % user_id
+
+
+def connect_user(*, user_id: int) -> None:
+    """
+    registration of a new websocket connection of the user, the database
+    is written only when the user was offline before this connection
+    """
+    cache.add(presence_connections_key(user_id), 0, PRESENCE_TIMEOUT)
+    try:
+        cache.incr(presence_connections_key(user_id))
+    except ValueError:
+        cache.set(presence_connections_key(user_id), 1, PRESENCE_TIMEOUT)
+    if cache.add(presence_key(user_id), True, PRESENCE_TIMEOUT):
+        User.objects.filter(id=user_id, is_online=False).update(is_online=True)
+
+
+def refresh_user(*, user_id: int) -> None:
+    """heartbeat of a websocket connection of the user"""
+    if not cache.touch(presence_key(user_id), PRESENCE_TIMEOUT):
+        connect_user(user_id=user_id)
+        return
+    cache.touch(presence_connections_key(user_id), PRESENCE_TIMEOUT)
+
+
+def disconnect_user(*, user_id: int) -> None:
+    """
+    removal of a websocket connection of the user, the user goes offline
+    with the last one, the database is written only by this one
+    """
+    try:
+        connections: int = cache.decr(presence_connections_key(user_id))
+    except ValueError:
+        connections: int = 0
+    if connections <= 0:
+        cache.delete_many([presence_key(user_id), presence_connections_key(user_id)])
+        User.objects.filter(id=user_id, is_online=True).update(is_online=False)
+
+
+def get_online_user_ids(user_ids: Iterable[int]) -> set[int]:
+    """bulk "who is online" lookup by one cache request"""
+    keys: dict[str, int] = {presence_key(user_id): user_id for user_id in user_ids}
+    return {keys[key] for key in cache.get_many(keys)}
+
+
+def sync_users_online_status() -> None:
+    """
+    periodic sync of the is_online column, kept for the filters, with
+    the presence of the users marked as online: the users whose
+    connections were dropped without the disconnect go offline here
+    """
+    user_ids: list[int] = list(
+        User.objects.filter(is_online=True).values_list("id", flat=True)
+    )
+    for index in range(0, len(user_ids), PRESENCE_SYNC_BATCH_SIZE):
+        batch: list[int] = user_ids[index : index + PRESENCE_SYNC_BATCH_SIZE]
+        User.objects.filter(id__in=set(batch) - get_online_user_ids(batch)).update(
+            is_online=False
+        )
@@ -18,6 +18,9 @@ from authentication.constant.errors import (
     PASSWORDS_DO_NOT_MATCH_ERROR,
 )
 from authentication.models import Profile, User
+from authentication.presence import (
+    get_online_user_ids,
+)
 from authentication.validators import (
     CodeValidator,
 )
@@ -65,9 +68,13 @@ class EventUsersSerializer(serializers.ModelSerializer):
 
 
 class ProfileSerializer(serializers.ModelSerializer):
+    age: int = serializers.IntegerField(read_only=True)
+
     class Meta:
         model: Profile = Profile
-        fields: Union[str, list[str]] = "__all__"
+        exclude: Union[str, list[str]] = [
+            "search_name",
+        ]
 
 
 class CreateUpdateProfileSerializer(serializers.ModelSerializer):
@@ -75,7 +82,7 @@ class CreateUpdateProfileSerializer(serializers.ModelSerializer):
         model: Profile = Profile
         exclude: Union[str, list[str]] = [
             "created_at",
-            "age",
+            "search_name",
         ]
 
 
@@ -188,10 +195,31 @@ class LoginSerializer(serializers.ModelSerializer):
         return super().validate(attrs)
 
 
+class IsOnlineField(serializers.BooleanField):
+    """presence of the user, resolved for the whole list by its list serializer"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(source="*", read_only=True, **kwargs)
+
+    def to_representation(self, user: User) -> bool:
+        online_user_ids: set[int] = getattr(self.parent, "online_user_ids", None)
+        if online_user_ids is None:
+            online_user_ids = get_online_user_ids([user.id])
+        return user.id in online_user_ids
+
+
+class OnlineUsersListSerializer(serializers.ListSerializer):
+    def to_representation(self, data: Any) -> list[OrderedDict]:
+        users: list[User] = list(data.all() if hasattr(data, "all") else data)
+        self.child.online_user_ids = get_online_user_ids(user.id for user in users)
+        return super().to_representation(users)
+
+
 class UserSerializer(DynamicFieldsModelSerializer):
     """user pricate and public profile serializer"""
 
     profile: Profile = ProfileSerializer()
+    is_online: bool = IsOnlineField()
 
     class Meta:
         model: User = User
@@ -224,9 +252,11 @@ class ProfileListSerializer(serializers.ModelSerializer):
 
 class UsersListSerializer(serializers.ModelSerializer):
     profile = ProfileListSerializer()
+    is_online: bool = IsOnlineField()
 
     class Meta:
         model: User = User
+        list_serializer_class = OnlineUsersListSerializer
         fields: Union[str, list[str]] = [
             "id",
             "profile",
@@ -273,7 +303,7 @@ class ResetPasswordSerializer(serializers.Serializer):
     )
 
     class Meta:
-        validators = [CodeValidator(token_type=PASSWORD_RESET_CODE_TYPE)]
+        validators = [CodeValidator(token_type=[PASSWORD_RESET_CODE_TYPE])]
         fields: Union[str, list[str]] = [
             "verify_code",
             "new_password",
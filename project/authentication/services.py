@@ -1,7 +1,6 @@
-import random
+import secrets
 import string
-from datetime import date
-from typing import Any
+from typing import Any, Iterable, Optional
 
 from authentication.constant.code_types import (
     ACCOUNT_DELETE_CODE_TYPE,
@@ -11,6 +10,9 @@ from authentication.constant.code_types import (
     PASSWORD_RESET_CODE_TYPE,
     PHONE_CHANGE_CODE_TYPE,
 )
+from authentication.constant.errors import (
+    CODE_EXPIRED_ERROR,
+)
 from authentication.constant.success import (
     EMAIL_MESSAGE_TEMPLATE_TITLE,
     TEMPLATE_SUCCESS_BODY_TITLE,
@@ -23,25 +25,45 @@ from authentication.models import (
     User,
 )
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.template.loader import (
     render_to_string,
 )
 from django.utils import timezone
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import (
+    Serializer,
+    ValidationError,
+)
+from rest_framework.status import (
+    HTTP_400_BAD_REQUEST,
+)
+
+from .tasks import send_emails
+
+USER_CACHE_TIMEOUT: int = 60 * 5
+CODE_ALLOCATION_ATTEMPTS: int = 5
+
 
-from .tasks import Util
+def user_cache_key(user_id: int) -> str:
+    return "user_%s" % user_id
 
 
-def count_age(*, profile: Profile, data: dict[str, Any]) -> Profile:
-    """calculation of age after registration by the birthday parameter"""
-    for item in data:
-        if item[0] == "birthday":
-            birthday: date = item[1]
-            age: int = (timezone.now().date() - birthday) // timezone.timedelta(
-                days=365
-            )
-            profile.age: int = age
-            return profile.save()
+def get_cached_user(*, user_id: int) -> Optional[User]:
+    """user with the profile, cached for the authentication by the tokens"""
+    user: Optional[User] = cache.get(user_cache_key(user_id))
+    if user is None:
+        user = User.objects.select_related("profile").filter(id=user_id).first()
+        if user is not None:
+            cache.set(user_cache_key(user_id), user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_users_cache(*, user_ids: Iterable[int]) -> None:
+    keys: list[str] = [user_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    # a concurrent request can cache the old state until the transaction is committed
+    transaction.on_commit(lambda: cache.delete_many(keys))
 
 
 def send_email_template(*, user: User, body_title: str, title: str, text: str) -> None:
@@ -55,7 +77,7 @@ def send_email_template(*, user: User, body_title: str, title: str, text: str) -
         "text": text,
     }
     message: str = render_to_string("email_confirm.html", context)
-    Util.send_email.delay(data={"email_body": message, "to_email": user.email})
+    send_emails.delay(messages=[{"email_body": message, "to_email": user.email}])
 
 
 def check_code_type(*, code: Code) -> str:
@@ -74,21 +96,40 @@ def check_code_type(*, code: Code) -> str:
     return title
 
 
+def generate_verify_code() -> str:
+    return "".join(
+        secrets.choice(string.ascii_uppercase)
+        for _ in range(Code._meta.get_field("verify_code").max_length)
+    )
+
+
+def allocate_code(*, email: str, type: str, dop_info: str) -> Code:
+    """
+    the code replaces the code of the same type sent to the email
+    before, and is unique among the codes of the email and among all
+    the password reset codes, the rare collisions are retried with
+    the new codes at most CODE_ALLOCATION_ATTEMPTS times
+    """
+    for attempt in range(1, CODE_ALLOCATION_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                Code.objects.filter(user_email=email, type=type).delete()
+                return Code.objects.create(
+                    dop_info=dop_info,
+                    verify_code=generate_verify_code(),
+                    user_email=email,
+                    type=type,
+                    life_time=timezone.now()
+                    + timezone.timedelta(minutes=settings.CODE_EXPIRE_MINUTES_TIME),
+                )
+        except IntegrityError:
+            if attempt == CODE_ALLOCATION_ATTEMPTS:
+                raise
+
+
 def code_create(*, email: str, type: str, dop_info: str) -> None:
     """create email verification code"""
-    verify_code: str = "".join(
-        random.choices(
-            string.ascii_uppercase, k=Code._meta.get_field("verify_code").max_length
-        )
-    )
-    code: Code = Code.objects.create(
-        dop_info=dop_info,
-        verify_code=verify_code,
-        user_email=email,
-        type=type,
-        life_time=timezone.now()
-        + timezone.timedelta(minutes=settings.CODE_EXPIRE_MINUTES_TIME),
-    )
+    code: Code = allocate_code(email=email, type=type, dop_info=dop_info)
     user: User = User.objects.get(email=email)
     context: dict = {
         "title": check_code_type(code=code),
@@ -97,22 +138,37 @@ def code_create(*, email: str, type: str, dop_info: str) -> None:
         "surname": user.profile.last_name,
     }
     template: str = render_to_string("email_code.html", context)
-    print(verify_code)
-    Util.send_email.delay(data={"email_body": template, "to_email": email})
+    send_emails.delay(messages=[{"email_body": template, "to_email": email}])
 
 
 def profile_update(*, user: User, serializer: Serializer) -> None:
     serializer.is_valid(raise_exception=True)
     profile: Profile = Profile.objects.filter(id=user.profile_id)
-    profile.update(**serializer.validated_data["profile"])
-    count_age(profile=profile[0], data=serializer.validated_data["profile"].items())
+    profile.update(
+        **serializer.validated_data["profile"],
+        search_name=Profile.get_search_name(serializer.validated_data["profile"]),
+    )
     serializer.validated_data.pop("profile")
     serializer.save()
 
 
+def get_valid_code(*, verify_code: str, **scope: str) -> Code:
+    """
+    the code is looked up in the scope of the email or the type,
+    and checked for the expiration at the moment of the use
+    """
+    code: Optional[Code] = (
+        Code.get_valid().filter(verify_code=verify_code, **scope).first()
+    )
+    if code is None:
+        raise ValidationError(CODE_EXPIRED_ERROR, HTTP_400_BAD_REQUEST)
+    return code
+
+
 def reset_password(*, data: dict[str, Any]) -> None:
-    verify_code: str = data["verify_code"]
-    code: Code = Code.objects.get(verify_code=verify_code)
+    code: Code = get_valid_code(
+        verify_code=data["verify_code"], type=PASSWORD_RESET_CODE_TYPE
+    )
     user: User = User.objects.get(email=code.user_email)
     user.set_password(data["new_password"])
     user.save()
@@ -0,0 +1,31 @@
+from typing import Any
+
+from authentication.models import Profile, User
+from authentication.services import (
+    invalidate_users_cache,
+)
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_after_change(
+    sender: User, instance: User, **kwargs: Any
+) -> None:
+    invalidate_users_cache(user_ids=[instance.id])
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_user_cache_after_change(
+    sender: Profile, instance: Profile, **kwargs: Any
+) -> None:
+    invalidate_users_cache(
+        user_ids=User.objects.filter(profile_id=instance.id).values_list(
+            "id", flat=True
+        )
+    )
@@ -1,54 +1,68 @@
-import threading
-from typing import Any, final
+from datetime import datetime
+from typing import Any, Optional
 
-from authentication.constant.success import (
-    BLANBALL,
+from authentication.mail import (
+    send_email_messages,
 )
+from authentication.presence import (
+    sync_users_online_status,
+)
+from celery import Task
 from config.celery import app
-from dateutil.relativedelta import relativedelta
-from django.core.mail import EmailMessage
 from django.utils import timezone
 
-from .models import Code, Profile
-
+from .models import Code
 
-class EmailThread(threading.Thread):
-    def __init__(self, email: str) -> None:
-        self.email: str = email
-        threading.Thread.__init__(self)
+CODES_DELETE_BATCH_SIZE: int = 10000
 
-    def run(self) -> None:
-        self.email.send()
 
-
-@final
-class Util:
-    @staticmethod
-    @app.task(
-        ignore_result=True,
-        time_limit=5,
-        soft_time_limit=3,
-        default_retry_delay=5,
-    )
-    def send_email(*, data: dict[str, Any]) -> None:
-        send: EmailMessage = EmailMessage(
-            subject=BLANBALL, body=data["email_body"], to=[data["to_email"]]
-        )
-        send.content_subtype = "html"
-        EmailThread(send).start()
+@app.task(
+    bind=True,
+    max_retries=5,
+    default_retry_delay=5,
+    time_limit=60,
+    soft_time_limit=55,
+)
+def send_emails(
+    self: Task,
+    *,
+    messages: list[dict[str, str]],
+    outcomes: Optional[list[dict[str, Any]]] = None,
+) -> list[dict[str, Any]]:
+    """
+    sending of the messages over the pooled connection of the worker,
+    which is reused by the next tasks, the messages failed with the
+    transient errors are retried by the task, returns the outcome of
+    every message
+    """
+    sent, failed = send_email_messages(messages)
+    outcomes = (outcomes or []) + sent
+    if failed and self.request.retries < self.max_retries:
+        raise self.retry(kwargs={"messages": failed, "outcomes": outcomes})
+    return outcomes + [
+        {"to_email": data["to_email"], "success": False, "error": "retries exceeded"}
+        for data in failed
+    ]
 
 
 @app.task
 def delete_expire_codes() -> None:
-    for code in Code.objects.all():
-        if code.life_time < timezone.now():
-            code.delete()
+    """
+    removal of the expired codes by the ranges of the life_time
+    index, CODES_DELETE_BATCH_SIZE codes by one statement
+    """
+    now: datetime = timezone.now()
+    while (
+        Code.objects.filter(
+            id__in=Code.objects.filter(life_time__lte=now)
+            .order_by("life_time")
+            .values("id")[:CODES_DELETE_BATCH_SIZE]
+        ).delete()[0]
+        == CODES_DELETE_BATCH_SIZE
+    ):
+        pass
 
 
 @app.task
-def check_user_age() -> None:
-    for user_profile in Profile.objects.all():
-        rdelta = relativedelta(timezone.now().date(), user_profile.birthday)
-        if rdelta.months == 0 and rdelta.days == 0:
-            user_profile.age += 1
-            user_profile.save()
+def sync_users_presence() -> None:
+    sync_users_online_status()
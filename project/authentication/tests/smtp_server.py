@@ -0,0 +1,71 @@
+import socketserver
+import threading
+from typing import Any
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """the minimal smtp dialog of the django smtp backend"""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(("%s\r\n" % line).encode())
+
+    def handle(self) -> None:
+        self.server.connections += 1
+        self.reply("220 localhost")
+        recipients: list[str] = []
+        while line := self.rfile.readline():
+            command: str = line.decode().strip()
+            verb: str = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient: str = command.split(":", 1)[1].strip(" <>")
+                if recipient in self.server.refused_recipients:
+                    self.reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(recipient)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.messages.extend(recipients)
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    """
+    local stand-in of the smtp server, records the
+    recipients of the received messages and the connections
+    """
+
+    daemon_threads: bool = True
+    allow_reuse_address: bool = True
+
+    def __init__(self, refused_recipients: tuple[str, ...] = ()) -> None:
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.refused_recipients: tuple[str, ...] = refused_recipients
+        self.messages: list[str] = []
+        self.connections: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> "SMTPServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
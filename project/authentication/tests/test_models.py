@@ -1,6 +1,25 @@
+from unittest import mock
+
 import jwt
-from authentication.models import Profile, User
+from authentication.models import (
+    Code,
+    Profile,
+    User,
+)
+from authentication.presence import (
+    connect_user,
+    disconnect_user,
+    get_online_user_ids,
+    sync_users_online_status,
+)
+from authentication.services import allocate_code
+from authentication.tasks import (
+    delete_expire_codes,
+)
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.utils import timezone
 
 from .set_up import SetUpAuthenticationModels
 
@@ -26,3 +45,85 @@ class TestAuthenticationModels(SetUpAuthenticationModels):
             self.user.tokens()["access"], settings.SECRET_KEY, settings.ALGORITHM
         )
         self.assertEqual(self.user.id, payload["user_id"])
+
+    def test_profile_search_name(self) -> None:
+        self.assertEqual(self.profile.search_name, "John Jesus")
+        Profile.objects.filter(id=self.profile.id).update(
+            last_name="Smith",
+            search_name=Profile.get_search_name({"last_name": "Smith"}),
+        )
+        self.assertEqual(Profile.objects.get().search_name, "John Smith")
+
+    def test_user_presence_with_many_connections(self) -> None:
+        cache.clear()
+        connect_user(user_id=self.user.id)
+        connect_user(user_id=self.user.id)
+        self.assertTrue(User.objects.get().is_online)
+        disconnect_user(user_id=self.user.id)
+        self.assertEqual(get_online_user_ids([self.user.id, 0]), {self.user.id})
+        disconnect_user(user_id=self.user.id)
+        self.assertEqual(get_online_user_ids([self.user.id]), set())
+        self.assertFalse(User.objects.get().is_online)
+
+    def test_sync_users_with_dropped_connections(self) -> None:
+        cache.clear()
+        connect_user(user_id=self.user.id)
+        # the heartbeats of the dropped connection stopped
+        cache.clear()
+        self.assertTrue(User.objects.get().is_online)
+        sync_users_online_status()
+        self.assertFalse(User.objects.get().is_online)
+
+    def test_delete_expire_codes(self) -> None:
+        now: timezone.datetime = timezone.now()
+        Code.objects.bulk_create(
+            Code(
+                verify_code="%05d" % index,
+                life_time=now + timezone.timedelta(minutes=index - 3),
+                type="email_verify",
+                user_email="user%s@example.com" % index,
+            )
+            for index in range(6)
+        )
+        self.assertEqual(Code.get_valid().count(), 2)
+        with mock.patch("authentication.tasks.CODES_DELETE_BATCH_SIZE", 2):
+            delete_expire_codes()
+        self.assertEqual(
+            list(Code.objects.order_by("id").values_list("verify_code", flat=True)),
+            ["00004", "00005"],
+        )
+
+    def test_code_allocation_with_collisions(self) -> None:
+        with mock.patch(
+            "authentication.services.generate_verify_code",
+            side_effect=["AAAAA", "AAAAA", "AAAAA", "BBBBB"],
+        ):
+            allocate_code(email="john@example.com", type="phone_change", dop_info="")
+            allocate_code(email="brian@example.com", type="phone_change", dop_info="")
+            allocate_code(email="john@example.com", type="password_reset", dop_info="")
+        self.assertEqual(
+            list(
+                Code.objects.order_by("id").values_list(
+                    "user_email", "type", "verify_code"
+                )
+            ),
+            [
+                ("john@example.com", "phone_change", "AAAAA"),
+                ("brian@example.com", "phone_change", "AAAAA"),
+                ("john@example.com", "password_reset", "BBBBB"),
+            ],
+        )
+        with mock.patch(
+            "authentication.services.generate_verify_code", return_value="CCCCC"
+        ):
+            allocate_code(email="john@example.com", type="phone_change", dop_info="")
+        self.assertEqual(
+            Code.objects.get(
+                user_email="john@example.com", type="phone_change"
+            ).verify_code,
+            "CCCCC",
+        )
+        with mock.patch(
+            "authentication.services.generate_verify_code", return_value="BBBBB"
+        ), self.assertRaises(IntegrityError):
+            allocate_code(email="brian@example.com", type="password_reset", dop_info="")
@@ -0,0 +1,100 @@
+import os
+import socket
+from unittest import skipUnless
+
+from authentication import mail
+from authentication.mail import (
+    close_email_connection,
+    send_email_messages,
+)
+from authentication.tasks import send_emails
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from .smtp_server import SMTPServer
+
+EMAIL_LOAD_TEST_MESSAGES: int = 2000
+LOAD_TESTS: bool = bool(os.environ.get("LOAD_TESTS"))
+
+
+def smtp_settings(server: SMTPServer) -> override_settings:
+    return override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+        EMAIL_HOST="127.0.0.1",
+        EMAIL_PORT=server.port,
+        EMAIL_USE_TLS=False,
+        EMAIL_HOST_USER="",
+        EMAIL_HOST_PASSWORD="",
+    )
+
+
+def messages(count: int) -> list[dict[str, str]]:
+    return [
+        {"email_body": "<p>%s</p>" % index, "to_email": "user%s@example.com" % index}
+        for index in range(count)
+    ]
+
+
+class TestAuthenticationTasks(APITestCase):
+    def setUp(self) -> None:
+        close_email_connection()
+        self.addCleanup(close_email_connection)
+        return super().setUp()
+
+    def test_send_emails_over_one_connection(self) -> None:
+        with SMTPServer(refused_recipients=("user1@example.com",)) as server:
+            with smtp_settings(server):
+                outcomes = send_emails.apply(kwargs={"messages": messages(3)}).get()
+                send_emails.apply(kwargs={"messages": messages(1)})
+        self.assertEqual(
+            [(outcome["to_email"], outcome["success"]) for outcome in outcomes],
+            [
+                ("user0@example.com", True),
+                ("user1@example.com", False),
+                ("user2@example.com", True),
+            ],
+        )
+        self.assertEqual(
+            server.messages,
+            ["user0@example.com", "user2@example.com", "user0@example.com"],
+        )
+        self.assertEqual(server.connections, 1)
+
+    def test_send_emails_after_dropped_connection(self) -> None:
+        with SMTPServer() as server:
+            with smtp_settings(server):
+                send_email_messages(messages(1))
+                # the idle connection was dropped
+                mail._connection.connection.sock.shutdown(socket.SHUT_RDWR)
+                outcomes, failed = send_email_messages(messages(2))
+        self.assertEqual([outcome["success"] for outcome in outcomes], [True, True])
+        self.assertEqual(failed, [])
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 2)
+
+    def test_send_emails_without_server(self) -> None:
+        with SMTPServer() as server:
+            pass
+        with smtp_settings(server):
+            outcomes, failed = send_email_messages(messages(2))
+            self.assertEqual((outcomes, failed), ([], messages(2)))
+            outcomes = send_emails.apply(kwargs={"messages": messages(1)}).get()
+        self.assertEqual(
+            outcomes,
+            [
+                {
+                    "to_email": "user0@example.com",
+                    "success": False,
+                    "error": "retries exceeded",
+                }
+            ],
+        )
+
+    @skipUnless(LOAD_TESTS, "the load tests are enabled by LOAD_TESTS=1")
+    def test_send_emails_load(self) -> None:
+        with SMTPServer() as server:
+            with smtp_settings(server):
+                for message in messages(EMAIL_LOAD_TEST_MESSAGES):
+                    send_emails.apply(kwargs={"messages": [message]})
+        self.assertEqual(len(server.messages), EMAIL_LOAD_TEST_MESSAGES)
+        self.assertEqual(server.connections, 1)
@@ -5,6 +5,11 @@ from authentication.models import (
     Profile,
     User,
 )
+from authentication.presence import (
+    connect_user,
+    disconnect_user,
+)
+from django.core.cache import cache
 from django.urls import reverse
 from freezegun import freeze_time
 from rest_framework.status import (
@@ -87,6 +92,19 @@ class TestAuthenticationViews(SetUpAauthenticationViews):
         self.assertEqual(User.objects.first().phone, self.user_register_data["phone"])
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
 
+    def test_check_replaced_code(self) -> None:
+        self.auth()
+        self.client.post(
+            reverse("request-change-phone"), self.request_change_phone_data
+        )
+        verify_code: str = Code.objects.get().verify_code
+        self.client.post(
+            reverse("request-change-phone"), self.request_change_phone_data
+        )
+        response = self.client.post(reverse("check-code"), {"verify_code": verify_code})
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(Code.objects.count(), 1)
+
     def test_change_email(self) -> None:
         self.auth()
         self.client.post(
@@ -150,6 +168,89 @@ class TestAuthenticationViews(SetUpAauthenticationViews):
         response = self.client.get(reverse("users-list"))
         self.assertEqual(response.status_code, HTTP_200_OK)
 
+    def test_get_online_users_list(self) -> None:
+        cache.clear()
+        self.auth()
+        user: User = User.objects.get(email=self.user_register_data["email"])
+        connect_user(user_id=user.id)
+        response = self.client.get(reverse("users-list"), {"is_online": True})
+        self.assertEqual(
+            [(user["id"], user["is_online"]) for user in response.data["results"]],
+            [(user.id, True)],
+        )
+        disconnect_user(user_id=user.id)
+        response = self.client.get(reverse("users-list"), {"is_online": False})
+        self.assertEqual(
+            [(user["id"], user["is_online"]) for user in response.data["results"]],
+            [(user.id, False)],
+        )
+
+    def test_get_my_profile_with_cached_user(self) -> None:
+        cache.clear()
+        self.client.post(reverse("register"), self.user_register_data)
+        user: User = User.objects.get(email=self.user_register_data["email"])
+        self.client.credentials(
+            HTTP_AUTHORIZATION="Bearer %s" % user.tokens()["access"]
+        )
+        self.client.get(reverse("my-profile"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("my-profile"))
+        self.assertEqual(response.data["email"], self.user_register_data["email"])
+
+        user.phone = "+380683861970"
+        user.save()
+        response = self.client.get(reverse("my-profile"))
+        self.assertEqual(response.data["phone"], "+380683861970")
+
+    def test_get_relevant_users_list(self) -> None:
+        self.auth()
+        User.objects.create(
+            email="brian@example.com",
+            phone="+380683861970",
+            profile=Profile.objects.create(
+                **self.user_register_data["profile"]
+                | {"name": "Brian", "last_name": "Eno"}
+            ),
+        )
+        response = self.client.get(reverse("users-relevant-list"), {"search": "strin"})
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            [user["profile"]["name"] for user in response.data["results"]], ["string"]
+        )
+
+    @freeze_time("2024-02-29")
+    def test_get_users_list_by_age(self) -> None:
+        self.auth()
+        for index, birthday in enumerate(["2000-02-29", "2000-03-01", "2004-02-28"]):
+            User.objects.create(
+                email="user%s@example.com" % index,
+                phone="+38068386197%s" % index,
+                role="User",
+                profile=Profile.objects.create(
+                    **self.user_register_data["profile"] | {"birthday": birthday}
+                ),
+            )
+        response = self.client.get(reverse("users-list"), {"ordering": "profile__age"})
+        self.assertEqual(
+            [user["profile"]["age"] for user in response.data["results"]],
+            [20, 23, 23, 24],
+        )
+        response = self.client.get(
+            reverse("users-list"), {"ordering": "profile__age", "cursor": ""}
+        )
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse("users-list"), {"profile__age_min": 24})
+        self.assertEqual(
+            [user["id"] for user in response.data["results"]],
+            [User.objects.get(email="user0@example.com").id],
+        )
+        response = self.client.get(
+            reverse("users-list"), {"profile__age_min": 21, "profile__age_max": 23}
+        )
+        self.assertEqual(
+            [user["profile"]["age"] for user in response.data["results"]], [23, 23]
+        )
+
     def test_reset_password(self) -> None:
         new_pass = "19211921"
         self.client.post(reverse("register"), self.user_register_data)
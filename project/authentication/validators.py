@@ -1,12 +1,16 @@
 from collections import OrderedDict
+from typing import Optional
 
 from authentication.constant.errors import (
     BAD_CODE_ERROR,
     CODE_EXPIRED_ERROR,
 )
 from authentication.models import Code
+from django.db.models.query import QuerySet
 from django.utils import timezone
+from rest_framework.request import Request
 from rest_framework.serializers import (
+    Serializer,
     ValidationError,
 )
 from rest_framework.status import (
@@ -15,16 +19,23 @@ from rest_framework.status import (
 
 
 class CodeValidator:
+    # the codes of the authorized user are looked up among the codes of their email
+    requires_context: bool = True
+
     def __init__(self, token_type: list[str]) -> None:
         self.token_type = token_type
 
-    def __call__(self, attrs: OrderedDict) -> OrderedDict:
+    def __call__(self, attrs: OrderedDict, serializer: Serializer) -> OrderedDict:
         self.verify_code = attrs.get("verify_code")
-        self.code = Code.objects.filter(verify_code=self.verify_code)
-        if not self.code:
-            raise ValidationError(BAD_CODE_ERROR, HTTP_400_BAD_REQUEST)
-        elif Code.objects.get(verify_code=self.verify_code).type not in self.token_type:
+        codes: QuerySet[Code] = Code.objects.filter(
+            verify_code=self.verify_code, type__in=self.token_type
+        )
+        request: Optional[Request] = serializer.context.get("request")
+        if request and request.user.is_authenticated:
+            codes = codes.filter(user_email=request.user.email)
+        code: Optional[Code] = codes.only("life_time").first()
+        if not code:
             raise ValidationError(BAD_CODE_ERROR, HTTP_400_BAD_REQUEST)
-        elif Code.objects.get(verify_code=self.verify_code).life_time < timezone.now():
+        elif code.life_time < timezone.now():
             raise ValidationError(CODE_EXPIRED_ERROR, HTTP_400_BAD_REQUEST)
         return attrs
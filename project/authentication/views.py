@@ -10,7 +10,6 @@ from authentication.constant.code_types import (
 )
 from authentication.constant.errors import (
     ALREADY_VERIFIED_ERROR,
-    NO_PERMISSIONS_ERROR,
     NO_SUCH_IMAGE_ERROR,
     THIS_EMAIL_ALREADY_IN_USE_ERROR,
     WRONG_PASSWORD_ERROR,
@@ -39,6 +38,7 @@ from authentication.constant.success import (
 from authentication.filters import (
     RankedFuzzySearchFilter,
     UserAgeRangeFilter,
+    UserOrderingFilter,
 )
 from authentication.models import (
     Code,
@@ -62,13 +62,16 @@ from authentication.serializers import (
 )
 from authentication.services import (
     code_create,
-    count_age,
+    get_valid_code,
     profile_update,
     reset_password,
     send_email_template,
 )
 from config.exceptions import _404
-from config.yasg import skip_param
+from config.pagination import (
+    CustomCursorPagination,
+)
+from config.yasg import cursor_param, skip_param
 from django.conf import settings
 from django.db import transaction
 from django.db.models.query import QuerySet
@@ -82,20 +85,14 @@ from drf_yasg.utils import swagger_auto_schema
 from events.services import (
     skip_objects_from_response_by_id,
 )
-from rest_framework.filters import (
-    OrderingFilter,
-    SearchFilter,
-)
+from rest_framework.filters import SearchFilter
 from rest_framework.generics import (
     GenericAPIView,
     ListAPIView,
 )
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.serializers import (
-    Serializer,
-    ValidationError,
-)
+from rest_framework.serializers import Serializer
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
@@ -122,7 +119,6 @@ class RegisterUser(GenericAPIView):
         profile: Profile = Profile.objects.create(
             **serializer.validated_data["profile"]
         )
-        count_age(profile=profile, data=serializer.validated_data["profile"].items())
         serializer.save(profile=profile)
         user: User = User.objects.get(profile=profile.id)
         send_email_template(
@@ -169,8 +165,7 @@ class UserOwnerProfile(GenericAPIView):
 
     def get(self, request: Request) -> Response:
         """get detail information about profile"""
-        user: User = User.objects.get(id=self.request.user.id)
-        serializer = self.serializer_class(user)
+        serializer = self.serializer_class(request.user)
         return Response(serializer.data, status=HTTP_200_OK)
 
     def delete(self, request: Request) -> Response:
@@ -227,7 +222,9 @@ class UserProfile(GenericAPIView):
             raise _404(object=User)
 
 
-@method_decorator(swagger_auto_schema(manual_parameters=[skip_param]), name="get")
+@method_decorator(
+    swagger_auto_schema(manual_parameters=[skip_param, cursor_param]), name="get"
+)
 class UsersList(ListAPIView):
     """
     This class makes it possible to
@@ -242,7 +239,7 @@ class UsersList(ListAPIView):
     filter_backends = [
         DjangoFilterBackend,
         SearchFilter,
-        OrderingFilter,
+        UserOrderingFilter,
     ]
     filterset_class = UserAgeRangeFilter
     ordering_fields: list[str] = ["id", "profile__age", "raiting"]
@@ -251,6 +248,7 @@ class UsersList(ListAPIView):
         "profile__gender",
         "profile__last_name",
     ]
+    pagination_class = CustomCursorPagination
     queryset: QuerySet[User] = User.get_all()
 
     @skip_objects_from_response_by_id
@@ -273,7 +271,7 @@ class UsersRelevantList(ListAPIView):
     ]
     serializer_class: Type[Serializer] = UsersListSerializer
     queryset: QuerySet[User] = User.get_all()
-    search_fields: list[str] = ["profile__name", "profile__last_name"]
+    search_fields: list[str] = ["profile__search_name"]
 
     def get_queryset(self) -> QuerySet[User]:
         return UsersList.get_queryset(self)
@@ -412,8 +410,9 @@ class CheckCode(GenericAPIView):
 
     serializer_class: Type[Serializer] = CheckCodeSerializer
 
-    def success(self, key: str) -> None:
-        self.user.save()
+    def success(self, key: str, field: str) -> None:
+        # the cached user is saved only with the changed field
+        self.user.save(update_fields=[field])
         self.code.delete()
         send_email_template(
             user=self.user,
@@ -423,27 +422,27 @@ class CheckCode(GenericAPIView):
         )
 
     def post(self, request: Request) -> Response:
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        verify_code: str = serializer.validated_data["verify_code"]
-        self.code: Code = Code.objects.get(verify_code=verify_code)
-        self.user: User = User.objects.get(id=request.user.id)
-        if self.code.user_email != self.user.email:
-            raise ValidationError(NO_PERMISSIONS_ERROR, HTTP_400_BAD_REQUEST)
+        self.user: User = request.user
+        self.code: Code = get_valid_code(
+            verify_code=serializer.validated_data["verify_code"],
+            user_email=self.user.email,
+        )
 
         if self.code.type == PASSWORD_CHANGE_CODE_TYPE:
             self.user.set_password(self.code.dop_info)
-            self.success(key="password")
+            self.success(key="password", field="password")
             return Response(CHANGE_PASSWORD_SUCCESS, status=HTTP_200_OK)
 
         elif self.code.type == PHONE_CHANGE_CODE_TYPE:
             self.user.phone = self.code.dop_info
-            self.success(key="phone number")
+            self.success(key="phone number", field="phone")
             return Response(CHANGE_PHONE_SUCCESS, status=HTTP_200_OK)
 
         elif self.code.type == EMAIL_CHANGE_CODE_TYPE:
             self.user.email = self.code.dop_info
-            self.success(key="email")
+            self.success(key="email", field="email")
             return Response(CHANGE_EMAIL_SUCCESS, status=HTTP_200_OK)
 
         elif self.code.type == ACCOUNT_DELETE_CODE_TYPE:
@@ -459,7 +458,7 @@ class CheckCode(GenericAPIView):
 
         elif self.code.type == EMAIL_VERIFY_CODE_TYPE:
             self.user.is_verified = True
-            self.user.save()
+            self.user.save(update_fields=["is_verified"])
             self.code.delete()
             send_email_template(
                 user=self.user,
@@ -19,8 +19,16 @@ app.conf.beat_schedule = {
         "task": "events.tasks.check_event_start_time",
         "schedule": crontab(minute="*/1"),
     },
-    "check_user_age": {
-        "task": "authentication.tasks.check_user_age",
-        "schedule": crontab(minute=0, hour=0),
+    "drain_notifications_outbox": {
+        "task": "notifications.tasks.drain_notifications_outbox",
+        "schedule": crontab(minute="*/1"),
+    },
+    "reconcile_notifications_counters": {
+        "task": "notifications.tasks.reconcile_notifications_counters",
+        "schedule": crontab(minute=30),
+    },
+    "sync_users_presence": {
+        "task": "authentication.tasks.sync_users_presence",
+        "schedule": crontab(minute="*/1"),
     },
 }
@@ -2,10 +2,21 @@ from collections import OrderedDict
 from typing import Any, Optional
 
 from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.exceptions import (
+    NotFound,
+    ValidationError,
+)
 from rest_framework.pagination import (
     PageNumberPagination,
 )
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import (
+    remove_query_param,
+    replace_query_param,
+)
 
 
 class CustomPagination(PageNumberPagination):
@@ -25,3 +36,71 @@ class CustomPagination(PageNumberPagination):
             ]
         )
         return Response(response_data)
+
+
+class CustomCursorPagination(CustomPagination):
+    """
+    page number pagination with the opt-in keyset mode: when the cursor
+    query param is passed (empty for the first page), the objects are
+    taken by the -id ordering after the id from the cursor, so the deep
+    pages cost the same as the first one and the total count is not
+    calculated. The keyset is built only on the id, so the ordering
+    query param is rejected together with the cursor
+    """
+
+    cursor_query_param: str = "cursor"
+    ordering_query_param: str = api_settings.ORDERING_PARAM
+    invalid_cursor_message: str = "Invalid cursor"
+    cursor_ordering_message: str = "Ordering is not supported with the cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet[Any], request: Request, view: Any = None
+    ) -> Optional[list[Any]]:
+        self.cursor: Optional[str] = request.query_params.get(self.cursor_query_param)
+        if self.cursor is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        if request.query_params.get(self.ordering_query_param):
+            raise ValidationError(
+                {self.ordering_query_param: self.cursor_ordering_message}
+            )
+        self.request = request
+        queryset = queryset.order_by("-id")
+        if self.cursor:
+            try:
+                queryset = queryset.filter(id__lt=int(self.cursor))
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+        results: list[Any] = list(queryset[: self.page_size + 1])
+        self.next_cursor: Optional[int] = None
+        if len(results) > self.page_size:
+            results = results[: self.page_size]
+            self.next_cursor = results[-1].id
+        return results
+
+    def get_next_cursor_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            remove_query_param(
+                self.request.build_absolute_uri(), self.page_query_param
+            ),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    def get_paginated_response(self, results: dict[str, Any]) -> Response:
+        if self.cursor is None:
+            return super().get_paginated_response(results)
+        response_data = OrderedDict(
+            [
+                ("total_count", None),
+                ("page_size", self.page_size),
+                ("current_page", None),
+                ("next", self.get_next_cursor_link()),
+                ("previous", None),
+                ("success", True),
+                ("results", results),
+            ]
+        )
+        return Response(response_data)
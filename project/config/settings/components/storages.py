@@ -22,6 +22,12 @@ if environ.get("GITHUB_WORKFLOW"):
             },
         },
     }
+    CACHES: dict[str, Any] = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://127.0.0.1:%s" % config("REDIS_PORT", cast=int),
+        }
+    }
 else:
     DATABASES: dict[str, Any] = {
         "default": {
@@ -41,6 +47,12 @@ else:
             },
         },
     }
+    CACHES: dict[str, Any] = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://redis:%s" % config("REDIS_PORT", cast=int),
+        }
+    }
 
 if not environ.get("GITHUB_WORKFLOW"):
     MINIO_ENDPOINT: str = config("FILE_STORAGE_ENDPOINT", cast=str)
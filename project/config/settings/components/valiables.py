@@ -40,6 +40,9 @@ DEFAULT_AUTO_FIELD: str = "django.db.models.BigAutoField"
 
 PAGINATION_PAGE_SIZE: int = config("PAGINATION_PAGE_SIZE", cast=int)
 
+# postgres text search configuration of the events search documents
+EVENTS_SEARCH_CONFIG: str = config("EVENTS_SEARCH_CONFIG", default="english", cast=str)
+
 AUTH_USER_MODEL: str = config("AUTH_USER_MODEL", cast=str)
 
 CODE_EXPIRE_MINUTES_TIME: int = config("CODE_EXPIRE_MINUTES_TIME", cast=int)
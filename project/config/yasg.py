@@ -1,15 +1,12 @@
-import json
-
 from django.urls import path
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
+from notifications.flags import load_config
 from rest_framework import permissions
 
 
 def get_current_version_for_swagger():
-    with open("./config/config.json", "r") as f:
-        json_data = json.load(f)
-        return json_data["version"]
+    return load_config()["version"]
 
 
 schema_view = get_schema_view(
@@ -37,3 +34,10 @@ skip_param = openapi.Parameter(
     description="skip objects example query: 1,2,3,4,5",
     type=openapi.TYPE_STRING,
 )
+
+cursor_param = openapi.Parameter(
+    "cursor",
+    openapi.IN_QUERY,
+    description="keyset pagination, empty for the first page, not combined with ordering",
+    type=openapi.TYPE_STRING,
+)
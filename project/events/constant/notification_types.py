@@ -13,6 +13,7 @@ UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT: str = (
 UPDATE_MESSAGE_ACCEPT_OR_DECLINE_REQUEST_TO_PARTICIPATION: str = (
     "update_message_accept_or_decline_request_to_participation"
 )
+UPDATE_MESSAGE_EVENT_FINISHED: str = "update_message_event_finished"
 RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE: str = (
     "response_to_request_for_participation"
 )
@@ -1,9 +1,19 @@
-from typing import Union
+from typing import Any, Union
 
+from authentication.filters import MySearchFilter
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+)
+from django.db.models import F
+from django.db.models.query import QuerySet
 from django_filters import (
     rest_framework as filters,
 )
 from events.models import Event
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 
 
 class EventDateTimeRangeFilter(filters.FilterSet):
@@ -19,3 +29,36 @@ class EventDateTimeRangeFilter(filters.FilterSet):
             "status",
             "duration",
         ]
+
+
+class PopularEventsFilter(filters.FilterSet):
+    class Meta:
+        model: Event = Event
+        fields: Union[str, list[str]] = [
+            "type",
+            "gender",
+        ]
+
+
+class EventsFullTextSearchFilter(MySearchFilter):
+    """
+    search of the events by the indexed search_vector document,
+    without an explicit ordering the results are ordered by the rank
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet[Event], view: Any
+    ) -> QuerySet[Event]:
+        search_terms: str = " ".join(self.get_search_terms(request))
+        if not search_terms:
+            return queryset
+
+        query: SearchQuery = SearchQuery(
+            search_terms, config=settings.EVENTS_SEARCH_CONFIG, search_type="websearch"
+        )
+        queryset = queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by("-rank", "-id")
+        return queryset
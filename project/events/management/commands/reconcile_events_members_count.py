@@ -0,0 +1,30 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+)
+from events.models import Event
+from events.services import (
+    update_events_members_count,
+)
+
+
+class Command(BaseCommand):
+    help: str = "recalculates the participants and fans counters of all events"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        event_ids: list[int] = []
+        for event_id in (
+            Event.objects.order_by("id").values_list("id", flat=True).iterator()
+        ):
+            event_ids.append(event_id)
+            if len(event_ids) == batch_size:
+                update_events_members_count(event_ids=event_ids)
+                event_ids = []
+        if event_ids:
+            update_events_members_count(event_ids=event_ids)
+        self.stdout.write(self.style.SUCCESS("Events members counters reconciled"))
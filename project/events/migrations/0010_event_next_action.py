@@ -0,0 +1,64 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:08
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# the reminders and the actions of the scheduler at the time of the migration
+REMINDERS_MINUTES = (1440, 120, 10)
+
+
+def get_next_action(*, date_and_time, duration, status, now):
+    if status == "Planned":
+        for minutes in REMINDERS_MINUTES:
+            remind_time = date_and_time - timezone.timedelta(minutes=minutes)
+            if remind_time > now:
+                return "Remind", remind_time
+        return "Activate", date_and_time
+    if status == "Active":
+        return "Finish", date_and_time + timezone.timedelta(minutes=duration)
+    return None, None
+
+
+def plan_events_next_action(apps, schema_editor) -> None:
+    Event = apps.get_model("events", "Event")
+    events = list(Event.objects.exclude(status="Finished"))
+    now = timezone.now()
+    for event in events:
+        event.next_action, event.next_action_time = get_next_action(
+            date_and_time=event.date_and_time,
+            duration=event.duration,
+            status=event.status,
+            now=now,
+        )
+    Event.objects.bulk_update(
+        events, ["next_action", "next_action_time"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0009_alter_event_contact_number_alter_event_price_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="next_action",
+            field=models.CharField(
+                choices=[
+                    ("Remind", "Remind"),
+                    ("Activate", "Activate"),
+                    ("Finish", "Finish"),
+                ],
+                max_length=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="next_action_time",
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.RunPython(plan_events_next_action, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+from django.db.models import (
+    Count,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+
+
+def count_events_members(apps, schema_editor) -> None:
+    Event = apps.get_model("events", "Event")
+
+    def members_count(through):
+        return Coalesce(
+            Subquery(
+                through.objects.filter(event_id=OuterRef("id"))
+                .values("event_id")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Event.objects.update(
+        count_current_users=members_count(Event.current_users.through),
+        count_current_fans=members_count(Event.current_fans.through),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0010_event_next_action"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="count_current_fans",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="count_current_users",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(count_events_members, migrations.RunPython.noop),
+    ]
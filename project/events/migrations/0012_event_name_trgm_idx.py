@@ -0,0 +1,21 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:22
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_initial"),
+        ("events", "0011_event_members_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="event_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+def fill_events_search_vector(apps, schema_editor) -> None:
+    Event = apps.get_model("events", "Event")
+    SearchVector = django.contrib.postgres.search.SearchVector
+    config = settings.EVENTS_SEARCH_CONFIG
+    Event.objects.update(
+        search_vector=SearchVector("name", weight="A", config=config)
+        + SearchVector("place", weight="B", config=config)
+        + SearchVector("description", weight="C", config=config)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0012_event_name_trgm_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        migrations.RunPython(fill_events_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="event_search_vector_idx"
+            ),
+        ),
+    ]
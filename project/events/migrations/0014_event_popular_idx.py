@@ -0,0 +1,37 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0013_event_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "Planned")),
+                fields=["-count_current_users", "-id"],
+                name="event_popular_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "Planned")),
+                fields=["type", "-count_current_users", "-id"],
+                name="event_popular_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("status", "Planned")),
+                fields=["gender", "-count_current_users", "-id"],
+                name="event_popular_gender_idx",
+            ),
+        ),
+    ]
@@ -4,12 +4,21 @@ from email.policy import default
 from typing import Any, Optional, final
 
 from authentication.models import Gender, User
+from django.conf import settings
+from django.contrib.postgres.indexes import (
+    GinIndex,
+)
+from django.contrib.postgres.search import (
+    SearchVector,
+    SearchVectorField,
+)
 from django.core.validators import (
     MaxValueValidator,
     MinValueValidator,
 )
 from django.db import models
 from django.db.models.query import QuerySet
+from django.utils import timezone
 from events.constant.notification_types import (
     INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
 )
@@ -31,6 +40,40 @@ from rest_framework.status import (
 )
 
 
+def get_event_next_action(
+    *, date_and_time: datetime, duration: int, status: str, now: datetime
+) -> tuple[Optional[str], Optional[datetime]]:
+    """
+    calculation of the next scheduler action for the event and the time
+    when it becomes due, reminders whose time has already passed are skipped
+    """
+    if status == Event.Status.PLANNED:
+        for minutes in Event.REMINDERS_MINUTES:
+            remind_time: datetime = date_and_time - timezone.timedelta(minutes=minutes)
+            if remind_time > now:
+                return Event.ScheduledAction.REMIND, remind_time
+        return Event.ScheduledAction.ACTIVATE, date_and_time
+    if status == Event.Status.ACTIVE:
+        return (
+            Event.ScheduledAction.FINISH,
+            date_and_time + timezone.timedelta(minutes=duration),
+        )
+    return None, None
+
+
+# the fields of the full text search document
+EVENT_SEARCH_FIELDS: frozenset[str] = frozenset(("name", "place", "description"))
+
+
+def get_event_search_vector() -> SearchVector:
+    """weighted full text search document of the event"""
+    return (
+        SearchVector("name", weight="A", config=settings.EVENTS_SEARCH_CONFIG)
+        + SearchVector("place", weight="B", config=settings.EVENTS_SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=settings.EVENTS_SEARCH_CONFIG)
+    )
+
+
 class Event(models.Model):
     """footbal ivent model"""
 
@@ -70,6 +113,16 @@ class Event(models.Model):
         MINUTES_170: int = 170
         MINUTES_180: int = 180
 
+    class ScheduledAction(models.TextChoices):
+        """actions that the scheduler performs on the event"""
+
+        REMIND: str = "Remind"
+        ACTIVATE: str = "Activate"
+        FINISH: str = "Finish"
+
+    # how many minutes before the start participants are reminded of the event
+    REMINDERS_MINUTES: tuple[int, ...] = (1440, 120, 10)
+
     author: User = models.ForeignKey(User, on_delete=models.CASCADE)
     name: str = models.CharField(max_length=255)
     description: str = models.TextField()
@@ -102,14 +155,34 @@ class Event(models.Model):
     black_list: list[User] = models.ManyToManyField(
         User, related_name="black_list", blank=True
     )
+    next_action: str = models.CharField(
+        choices=ScheduledAction.choices, max_length=10, null=True
+    )
+    next_action_time: datetime = models.DateTimeField(null=True, db_index=True)
+    # denormalized sizes of current_users and current_fans,
+    # maintained by the m2m_changed receivers in events.signals
+    count_current_users: int = models.PositiveSmallIntegerField(default=0)
+    count_current_fans: int = models.PositiveIntegerField(default=0)
+    # full text search document, maintained by update_events_search_vector
+    search_vector: str = SearchVectorField(null=True)
+
+    def plan_next_action(self, now: Optional[datetime] = None) -> None:
+        self.next_action, self.next_action_time = get_event_next_action(
+            date_and_time=self.date_and_time,
+            duration=self.duration,
+            status=self.status,
+            now=now or timezone.now(),
+        )
 
-    @property
-    def count_current_users(self) -> int:
-        return self.current_users.count()
-
-    @property
-    def count_current_fans(self) -> int:
-        return self.current_fans.count()
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.plan_next_action()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {
+                *kwargs["update_fields"],
+                "next_action",
+                "next_action_time",
+            }
+        super(Event, self).save(*args, **kwargs)
 
     @final
     def __repr__(self) -> str:
@@ -132,6 +205,33 @@ class Event(models.Model):
         db_table: str = "event"
         verbose_name: str = "event"
         verbose_name_plural: str = "events"
+        indexes = [
+            GinIndex(
+                name="event_name_trgm_idx",
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                name="event_search_vector_idx",
+                fields=["search_vector"],
+            ),
+            # leaderboards of the planned events by the participants counter
+            models.Index(
+                name="event_popular_idx",
+                fields=["-count_current_users", "-id"],
+                condition=models.Q(status="Planned"),
+            ),
+            models.Index(
+                name="event_popular_type_idx",
+                fields=["type", "-count_current_users", "-id"],
+                condition=models.Q(status="Planned"),
+            ),
+            models.Index(
+                name="event_popular_gender_idx",
+                fields=["gender", "-count_current_users", "-id"],
+                condition=models.Q(status="Planned"),
+            ),
+        ]
 
 
 class RequestToParticipation(models.Model):
@@ -37,6 +37,11 @@ class CreateEventSerializer(serializers.ModelSerializer):
             "status",
             "current_fans",
             "black_list",
+            "next_action",
+            "next_action_time",
+            "count_current_users",
+            "count_current_fans",
+            "search_vector",
         ]
 
 
@@ -50,6 +55,11 @@ class UpdateEventSerializer(serializers.ModelSerializer):
             "current_fans",
             "current_users",
             "black_list",
+            "next_action",
+            "next_action_time",
+            "count_current_users",
+            "count_current_fans",
+            "search_vector",
         ]
 
     def update(self, instance, validated_data: dict) -> OrderedDict:
@@ -62,7 +72,11 @@ class EventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model: Event = Event
-        fields: Union[str, list[str]] = "__all__"
+        exclude: Union[str, list[str]] = [
+            "next_action",
+            "next_action_time",
+            "search_vector",
+        ]
 
 
 class PopularIventsListSerializer(serializers.ModelSerializer):
@@ -1,4 +1,5 @@
 import json
+import logging
 import re
 from collections import OrderedDict
 from datetime import datetime
@@ -6,7 +7,9 @@ from typing import (
     Any,
     Callable,
     Generator,
+    Iterable,
     Optional,
+    Type,
     TypeVar,
     Union,
 )
@@ -14,14 +17,30 @@ from typing import (
 import pandas
 from authentication.models import User
 from config.exceptions import _404
-from django.db import transaction
-from django.db.models import Q
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    F,
+    Func,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
 from django.utils import timezone
 from events.constant.notification_types import (
+    EVENT_DELETE_NOTIFICATION_TYPE,
+    EVENT_TIME_NOTIFICATION_TYPE,
+    INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
     NEW_USER_ON_THE_EVENT_NOTIFICATION_TYPE,
     RESPONSE_TO_THE_INVITE_TO_EVENT_NOTIFICATION_TYPE,
     RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE,
+    UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT,
+    UPDATE_MESSAGE_ACCEPT_OR_DECLINE_REQUEST_TO_PARTICIPATION,
+    UPDATE_MESSAGE_EVENT_FINISHED,
     USER_REMOVE_FROM_EVENT_NOTIFICATION_TYPE,
 )
 from events.constant.response_error import (
@@ -36,8 +55,18 @@ from events.models import (
     Event,
     InviteToEvent,
     RequestToParticipation,
+    get_event_search_vector,
+)
+from events.tasks import (
+    send_notification_to_event_users,
+)
+from notifications.models import Notification
+from notifications.tasks import (
+    enqueue_messages,
+    send_notifications_to_users,
+    send_to_user,
+    send_to_users,
 )
-from notifications.tasks import send_to_user
 from rest_framework.exceptions import (
     PermissionDenied,
 )
@@ -52,118 +81,269 @@ from rest_framework.status import (
 
 bulk = TypeVar(Optional[Generator[list[dict[str, int]], None, None]])
 
+logger: logging.Logger = logging.getLogger(__name__)
 
-def bulk_delete_events(
-    *, data: dict[str, Any], queryset: QuerySet[Event], user: User
-) -> bulk:
-    for event_id in data:
-        try:
-            event: Event = queryset.get(id=event_id)
-            if event.author == user:
-                event.delete()
-                yield {"success": event_id}
-        except Event.DoesNotExist:
-            pass
+EVENTS_SCHEDULER_BATCH_SIZE: int = 500
+EVENT_CACHE_TIMEOUT: int = 60 * 10
 
 
-def bulk_accept_or_decline_invites_to_events(
-    *, data: dict[str, Union[list[int], bool]], request_user: User
+def claim_event_seat(*, event: Event, user: User) -> bool:
+    """
+    atomic taking of a seat in the event for the user.
+    The members counter is increased by a conditional update, so concurrent
+    joins are serialized on the event row and can not overfill it.
+    Returns False if the event is not planned or has no free seats
+    """
+    with transaction.atomic():
+        claimed: int = Event.objects.filter(
+            id=event.id,
+            status=Event.Status.PLANNED,
+            count_current_users__lt=F("amount_members"),
+        ).update(count_current_users=F("count_current_users") + 1)
+        if not claimed:
+            return False
+        user.current_rooms.add(event)
+        return True
+
+
+def bulk_delete_events(
+    *, data: dict[str, Any], queryset: QuerySet[Event], user: User
 ) -> bulk:
-    for invite_id in data["ids"]:
-        try:
-            invite: InviteToEvent = InviteToEvent.objects.get(id=invite_id)
-            if (
-                invite.recipient.id == request_user.id
-                and invite.status == invite.Status.WAITING
+    """
+    deletion of the user events: the ownership is resolved by one query,
+    the related rows are removed by one statement per table and the
+    participants and fans are notified by one batched job after the commit
+    """
+    with transaction.atomic():
+        event_ids: set[int] = set(
+            queryset.filter(id__in=data, author_id=user.id).values_list("id", flat=True)
+        )
+        if event_ids:
+            notifications: list[
+                tuple[int, dict[str, Any]]
+            ] = deleted_events_notifications(event_ids=event_ids)
+            RequestToParticipation.objects.filter(event_id__in=event_ids).delete()
+            for through in (
+                Event.current_users.through,
+                Event.current_fans.through,
+                Event.black_list.through,
             ):
-                if invite.event.current_users.count() < invite.event.amount_members:
-                    if data["type"] == True:
-                        invite.status = invite.Status.ACCEPTED
-                        invite.recipient.current_rooms.add(invite.event)
-                    else:
-                        invite.status = invite.Status.DECLINED
-
-                    invite.save()
-                    send_to_user(
-                        user=invite.sender,
-                        message_type=RESPONSE_TO_THE_INVITE_TO_EVENT_NOTIFICATION_TYPE,
-                        data={
-                            "recipient": {
-                                "id": invite.sender.id,
-                                "name": invite.sender.profile.name,
-                                "last_name": invite.sender.profile.last_name,
-                            },
-                            "event": {
-                                "id": invite.event.id,
-                                "name": invite.event.name,
-                            },
-                            "invite": {
-                                "id": invite.id,
-                                "response": data["type"],
-                            },
-                            "sender": {
-                                "id": invite.recipient.id,
-                                "name": invite.recipient.profile.name,
-                                "last_name": invite.recipient.profile.last_name,
-                            },
-                        },
-                    )
-                    yield {"success": invite_id}
+                through.objects.filter(event_id__in=event_ids).delete()
+            Event.objects.filter(id__in=event_ids).delete()
+            invalidate_events_cache(event_ids=event_ids)
+            transaction.on_commit(
+                lambda: send_notifications_to_users.delay(
+                    message_type=EVENT_DELETE_NOTIFICATION_TYPE,
+                    notifications=notifications,
+                )
+            )
+    for event_id in dict.fromkeys(data):
+        if event_id in event_ids:
+            yield {"success": event_id}
+
+
+def deleted_events_notifications(
+    *, event_ids: Iterable[int]
+) -> list[tuple[int, dict[str, Any]]]:
+    """
+    (user id, data) pairs of the delete notifications, resolved
+    before the participants and fans of the events are removed
+    """
+    return [
+        (
+            user_id,
+            {
+                "recipient": {
+                    "id": user_id,
+                    "name": name,
+                    "last_name": last_name,
+                },
+                "event": {
+                    "id": event_id,
+                    "start_time": None,
+                    "time_to_start": None,
+                },
+            },
+        )
+        for event_id, user_id, name, last_name in events_subscribers(
+            event_ids=event_ids
+        )
+    ]
 
-        except InviteToEvent.DoesNotExist:
-            pass
 
+def events_subscribers(*, event_ids: Iterable[int]) -> list[tuple[int, int, str, str]]:
+    """
+    unique (event id, user id, name, last name) rows
+    of the participants and fans of the events
+    """
+    subscribers: dict[tuple[int, int], tuple[int, int, str, str]] = {}
+    for through in (Event.current_users.through, Event.current_fans.through):
+        for row in through.objects.filter(event_id__in=event_ids).values_list(
+            "event_id", "user_id", "user__profile__name", "user__profile__last_name"
+        ):
+            subscribers.setdefault(row[:2], row)
+    return list(subscribers.values())
 
-def bulk_accpet_or_decline_requests_to_participation(
-    *, data: dict[str, Union[list[int], bool]], request_user: User
+
+def bulk_response_to_invites(
+    *,
+    model: Type[RequestToParticipation],
+    data: dict[str, Union[list[int], bool]],
+    request_user: User,
+    invited_user: str,
+    message_type: str,
+    update_message_type: str,
+    key: str,
 ) -> bulk:
-    for request_id in data["ids"]:
-        try:
-            request_to_p: RequestToParticipation = RequestToParticipation.objects.get(
-                id=request_id
+    """
+    set-based response to the invites or requests to participation:
+    all waiting rows of the user are loaded together with the related rows
+    by one query, the new status is written by one update and the
+    notifications are created and sent in one batch, all in one transaction
+    """
+    with transaction.atomic():
+        invites: dict[int, RequestToParticipation] = {
+            invite.id: invite
+            for invite in model.objects.select_related(
+                "event", "sender__profile", "recipient__profile"
+            ).filter(
+                id__in=data["ids"],
+                recipient_id=request_user.id,
+                status=model.Status.WAITING,
             )
-            if (
-                request_to_p.recipient.id == request_user.id
-                and request_to_p.status == request_to_p.Status.WAITING
+        }
+        status: str = model.Status.ACCEPTED if data["type"] else model.Status.DECLINED
+        answered: list[RequestToParticipation] = []
+        for invite_id in data["ids"]:
+            invite: Optional[RequestToParticipation] = invites.pop(invite_id, None)
+            if invite is None:
+                continue
+            if data["type"] == True and not claim_event_seat(
+                event=invite.event, user=getattr(invite, invited_user)
             ):
-                if data["type"] == True:
-                    if (
-                        request_to_p.event.current_users.count()
-                        < request_to_p.event.amount_members
-                    ):
-                        request_to_p.status = request_to_p.Status.ACCEPTED
-                        request_to_p.sender.current_rooms.add(request_to_p.event)
-                else:
-                    request_to_p.status = request_to_p.Status.DECLINED
-                request_to_p.save()
-                send_to_user(
-                    user=request_to_p.sender,
-                    message_type=RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE,
+                continue
+            invite.status = status
+            answered.append(invite)
+        if not answered:
+            return
+
+        model.objects.filter(id__in=[invite.id for invite in answered]).update(
+            status=status
+        )
+        notifications: list[Notification] = []
+        for invite in answered:
+            notifications.append(
+                Notification(
+                    user=invite.sender,
+                    message_type=message_type,
                     data={
                         "recipient": {
-                            "id": request_to_p.sender.id,
-                            "name": request_to_p.sender.profile.name,
-                            "last_name": request_to_p.sender.profile.last_name,
+                            "id": invite.sender.id,
+                            "name": invite.sender.profile.name,
+                            "last_name": invite.sender.profile.last_name,
                         },
                         "event": {
-                            "id": request_to_p.event.id,
-                            "name": request_to_p.event.name,
+                            "id": invite.event.id,
+                            "name": invite.event.name,
                         },
-                        "request": {
-                            "id": request_to_p.id,
+                        key: {
+                            "id": invite.id,
                             "response": data["type"],
                         },
                         "sender": {
-                            "id": request_to_p.recipient.id,
-                            "name": request_to_p.recipient.profile.name,
-                            "last_name": request_to_p.recipient.profile.last_name,
+                            "id": invite.recipient.id,
+                            "name": invite.recipient.profile.name,
+                            "last_name": invite.recipient.profile.last_name,
                         },
                     },
                 )
-                yield {"success": request_id}
+            )
+        send_to_users(notifications)
+        send_update_messages_after_response(
+            instances=answered, message_type=update_message_type
+        )
+    for invite in answered:
+        yield {"success": invite.id}
 
-        except RequestToParticipation.DoesNotExist:
-            pass
+
+def bulk_accept_or_decline_invites_to_events(
+    *, data: dict[str, Union[list[int], bool]], request_user: User
+) -> bulk:
+    return bulk_response_to_invites(
+        model=InviteToEvent,
+        data=data,
+        request_user=request_user,
+        invited_user="recipient",
+        message_type=RESPONSE_TO_THE_INVITE_TO_EVENT_NOTIFICATION_TYPE,
+        update_message_type=UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT,
+        key="invite",
+    )
+
+
+def bulk_accpet_or_decline_requests_to_participation(
+    *, data: dict[str, Union[list[int], bool]], request_user: User
+) -> bulk:
+    return bulk_response_to_invites(
+        model=RequestToParticipation,
+        data=data,
+        request_user=request_user,
+        invited_user="sender",
+        message_type=RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE,
+        update_message_type=UPDATE_MESSAGE_ACCEPT_OR_DECLINE_REQUEST_TO_PARTICIPATION,
+        key="request",
+    )
+
+
+def send_update_messages_after_response(
+    *,
+    instances: list[Union[InviteToEvent, RequestToParticipation]],
+    message_type: str,
+) -> None:
+    """
+    marking of the invite notifications with the response of the recipient
+    and sending of the update messages, by one query for all instances
+    """
+    status: dict[str, bool] = {
+        RequestToParticipation.Status.ACCEPTED: True,
+        RequestToParticipation.Status.DECLINED: False,
+    }
+    answered: dict[int, Union[InviteToEvent, RequestToParticipation]] = {
+        instance.id: instance
+        for instance in instances
+        if instance.status != instance.Status.WAITING
+    }
+    if not answered:
+        return
+    notifications: list[Notification] = list(
+        Notification.objects.filter(
+            message_type=INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
+            invite_id__in=list(answered),
+        )
+    )
+    for notification in notifications:
+        notification.data.update(
+            {"response": status[answered[notification.invite_id].status]}
+        )
+    Notification.objects.bulk_update(notifications, ["data"])
+    enqueue_messages(
+        [
+            (
+                answered[notification.invite_id].recipient.group_name,
+                {
+                    "type": "kafka.message",
+                    "message": {
+                        "message_type": message_type,
+                        "notification": {
+                            "id": notification.id,
+                            "message_type": notification.message_type,
+                            "response": notification.data["response"],
+                        },
+                    },
+                },
+            )
+            for notification in notifications
+        ]
+    )
 
 
 def event_create(
@@ -175,7 +355,7 @@ def event_create(
     try:
         contact_number: str = data["contact_number"]
     except KeyError:
-        contact_number: str = str(User.objects.get(id=request_user.id).phone)
+        contact_number: str = str(request_user.phone)
     data["contact_number"] = contact_number
     data["date_and_time"] = (
         pandas.to_datetime(data["date_and_time"].isoformat())
@@ -198,23 +378,187 @@ def send_notification_to_subscribe_event_user(
     start_time: datetime = None,
     time_to_start: int = None,
 ) -> None:
-    for user in list(event.current_users.all()) + list(event.current_fans.all()):
-        send_to_user(
-            user=user,
+    """
+    notification of the participants and fans of the event, delivered
+    after the commit by the fan-out job instead of the per user loop
+    """
+    data: dict[str, Any] = {
+        "event": {
+            "id": event.id,
+            "start_time": start_time,
+            "time_to_start": time_to_start,
+        }
+    }
+    transaction.on_commit(
+        lambda: send_notification_to_event_users.delay(
+            event_id=event.id,
             message_type=message_type,
-            data={
-                "recipient": {
-                    "id": user.id,
-                    "name": user.profile.name,
-                    "last_name": user.profile.last_name,
-                },
-                "event": {
-                    "id": event.id,
-                    "start_time": start_time,
-                    "time_to_start": time_to_start,
+            data=data,
+            fans=True,
+            recipient=True,
+        )
+    )
+
+
+def members_count(through: Type[models.Model]) -> Coalesce:
+    return Coalesce(
+        Subquery(
+            through.objects.filter(event_id=OuterRef("id"))
+            .values("event_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def update_events_members_count(*, event_ids: Iterable[int]) -> None:
+    """recalculation of the participants and fans counters of the events"""
+    Event.objects.filter(id__in=event_ids).update(
+        count_current_users=members_count(Event.current_users.through),
+        count_current_fans=members_count(Event.current_fans.through),
+    )
+    invalidate_events_cache(event_ids=event_ids)
+
+
+def event_cache_key(event_id: int) -> str:
+    return "event_%s" % event_id
+
+
+def event_black_list_cache_key(event_id: int) -> str:
+    return "event_black_list_%s" % event_id
+
+
+def invalidate_events_cache(*, event_ids: Iterable[int]) -> None:
+    """removal of the cached representations and black lists of the events"""
+    keys: list[str] = [
+        key
+        for event_id in event_ids
+        for key in (event_cache_key(event_id), event_black_list_cache_key(event_id))
+    ]
+    cache.delete_many(keys)
+    # a concurrent request can cache the old state until the transaction is committed
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_event_black_list(*, event_id: int) -> set[int]:
+    """ids of the users from the black list of the event, cached"""
+    black_list: Optional[set[int]] = cache.get(event_black_list_cache_key(event_id))
+    if black_list is None:
+        users_ids: list[Optional[int]] = list(
+            Event.objects.filter(id=event_id).values_list("black_list", flat=True)
+        )
+        if not users_ids:
+            raise _404(object=Event)
+        black_list = {user_id for user_id in users_ids if user_id is not None}
+        cache.set(event_black_list_cache_key(event_id), black_list, EVENT_CACHE_TIMEOUT)
+    return black_list
+
+
+def update_events_search_vector(*, event_ids: Iterable[int]) -> None:
+    """recalculation of the full text search documents of the events"""
+    Event.objects.filter(id__in=event_ids).update(
+        search_vector=get_event_search_vector()
+    )
+
+
+def mark_event_notifications_finished(*, event_id: int) -> None:
+    """
+    marking of the event notifications as finished by one jsonb_set
+    statement and one update message for each of their recipients
+    """
+    notifications: QuerySet[Notification] = Notification.objects.filter(
+        event_id=event_id
+    )
+    user_ids: list[int] = list(
+        notifications.order_by().values_list("user_id", flat=True).distinct()
+    )
+    notifications.update(
+        data=Func(
+            F("data"),
+            Value(["event", "finished"]),
+            Value(True, output_field=models.JSONField()),
+            function="jsonb_set",
+        )
+    )
+    enqueue_messages(
+        [
+            (
+                User(id=user_id).group_name,
+                {
+                    "type": "kafka.message",
+                    "message": {
+                        "message_type": UPDATE_MESSAGE_EVENT_FINISHED,
+                        "event": {"id": event_id, "finished": True},
+                    },
                 },
-            },
+            )
+            for user_id in user_ids
+        ]
+    )
+
+
+def update_event_schedule(*, event: Event) -> None:
+    """recalculation of the scheduler action after the event time was changed"""
+    event.plan_next_action()
+    Event.objects.filter(id=event.id).update(
+        next_action=event.next_action, next_action_time=event.next_action_time
+    )
+
+
+def run_event_scheduled_action(*, event: Event, now: datetime) -> None:
+    if event.next_action == Event.ScheduledAction.REMIND:
+        # a late reminder about an event that has already started is skipped
+        if event.date_and_time > now:
+            send_notification_to_subscribe_event_user(
+                event=event,
+                message_type=EVENT_TIME_NOTIFICATION_TYPE,
+                start_time=str(event.date_and_time),
+                time_to_start=(event.date_and_time - event.next_action_time)
+                // timezone.timedelta(minutes=1),
+            )
+        event.plan_next_action(now)
+        Event.objects.filter(id=event.id).update(
+            next_action=event.next_action, next_action_time=event.next_action_time
         )
+        return
+    if event.next_action == Event.ScheduledAction.ACTIVATE:
+        event.status = Event.Status.ACTIVE
+    elif event.next_action == Event.ScheduledAction.FINISH:
+        event.status = Event.Status.FINISHED
+    event.save(update_fields=["status"])
+
+
+def run_due_event_actions(*, now: Optional[datetime] = None) -> None:
+    """
+    performing of all scheduler actions that are due by now.
+    Only the rows whose next_action_time has come are read by the index,
+    rows locked by another worker are skipped. Every action moves the event
+    forward (reminders -> activation -> finish), so the loop always ends.
+    Every action runs in its own savepoint, a failed event is rolled back,
+    logged and skipped until the next run of the scheduler
+    """
+    now = now or timezone.now()
+    failed_event_ids: set[int] = set()
+    while True:
+        with transaction.atomic():
+            events: list[Event] = list(
+                Event.objects.select_for_update(skip_locked=True)
+                .filter(next_action_time__lte=now)
+                .exclude(id__in=failed_event_ids)
+                .order_by("next_action_time")[:EVENTS_SCHEDULER_BATCH_SIZE]
+            )
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        run_event_scheduled_action(event=event, now=now)
+                except Exception:
+                    logger.exception(
+                        "scheduler action of the event %s failed", event.id
+                    )
+                    failed_event_ids.add(event.id)
+        if not events:
+            return
 
 
 def validate_user_before_join_to_event(*, user: User, event: Event) -> None:
@@ -238,7 +582,7 @@ def validate_user_before_join_to_event(*, user: User, event: Event) -> None:
 
 def send_notification_to_event_author(*, event: Event, request_user: User) -> None:
     send_to_user(
-        user=User.objects.get(id=event.author.id),
+        user=event.author,
         message_type=NEW_USER_ON_THE_EVENT_NOTIFICATION_TYPE,
         data={
             "recipient": {
@@ -307,12 +651,9 @@ def not_in_black_list(
     func: Callable[[Request, int, ...], Response]
 ) -> Callable[[Request, int, ...], Response]:
     def wrap(self, request: Request, pk: int, *args: Any, **kwargs: Any) -> Any:
-        try:
-            if request.user in Event.objects.get(id=pk).black_list.all():
-                raise PermissionDenied()
-            return func(self, request, pk, *args, **kwargs)
-        except Event.DoesNotExist:
-            raise _404(object=Event)
+        if request.user.id in get_event_black_list(event_id=pk):
+            raise PermissionDenied()
+        return func(self, request, pk, *args, **kwargs)
 
     return wrap
 
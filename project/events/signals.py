@@ -1,7 +1,9 @@
 from gettext import install
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from authentication.models import User
+from django.db import transaction
+from django.db.models import F, Q
 from django.db.models.signals import (
     m2m_changed,
     post_save,
@@ -11,7 +13,6 @@ from django.dispatch import receiver
 from events.constant.notification_types import (
     EVENT_DELETE_NOTIFICATION_TYPE,
     EVENT_HAS_BEEN_ENDEN_NOTIFICATION_TYPE,
-    INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
     LAST_USER_ON_THE_EVENT_NOTIFICATION_TYPE,
     NEW_REQUEST_TO_PARTICIPATION_NOTIFICATION_TYPE,
     UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT,
@@ -19,22 +20,36 @@ from events.constant.notification_types import (
     YOU_ARE_LAST_USER_ON_THE_EVENT_NOTIFICATION_TYPE,
 )
 from events.models import (
+    EVENT_SEARCH_FIELDS,
     Event,
     InviteToEvent,
     RequestToParticipation,
 )
 from events.services import (
-    send_notification_to_subscribe_event_user,
+    deleted_events_notifications,
+    invalidate_events_cache,
+    mark_event_notifications_finished,
+    send_update_messages_after_response,
+    update_events_members_count,
+    update_events_search_vector,
+)
+from events.tasks import (
+    send_notification_to_event_users,
+)
+from notifications.tasks import (
+    send_notifications_to_users,
+    send_to_user,
 )
-from notifications.models import Notification
-from notifications.tasks import send, send_to_user
 
 
 def send_to_all_event_users(
     *, event: Event, message_type: str, data: dict[str, Any]
 ) -> None:
-    for user in list(event.current_users.all()) + [event.author]:
-        send_to_user(user, message_type=message_type, data=data)
+    transaction.on_commit(
+        lambda: send_notification_to_event_users.delay(
+            event_id=event.id, message_type=message_type, data=data, author=True
+        )
+    )
 
 
 @receiver(m2m_changed, sender=Event.current_users.through)
@@ -62,6 +77,85 @@ def send_message_when_last_user_join_to_event(
                 )
 
 
+def get_changed_events_ids(
+    sender: Any, instance: Union[Event, User], **kwargs: Any
+) -> Optional[list[int]]:
+    """ids of the events whose users relation was changed by the m2m_changed action"""
+    action: str = kwargs["action"]
+    if kwargs["reverse"] and action == "pre_clear":
+        # the relation is cleared from the user side, so the affected
+        # events are known only before the rows are deleted
+        instance._cleared_events_ids = list(
+            sender.objects.filter(user_id=instance.id).values_list(
+                "event_id", flat=True
+            )
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return None
+    if not kwargs["reverse"]:
+        return [instance.id]
+    if action == "post_clear":
+        return instance._cleared_events_ids
+    return list(kwargs["pk_set"])
+
+
+@receiver(m2m_changed, sender=Event.current_users.through)
+@receiver(m2m_changed, sender=Event.current_fans.through)
+def update_event_members_count_after_change(
+    sender: Any, instance: Union[Event, User], **kwargs: Any
+) -> None:
+    event_ids: Optional[list[int]] = get_changed_events_ids(sender, instance, **kwargs)
+    if event_ids is not None:
+        update_events_members_count(event_ids=event_ids)
+
+
+@receiver(m2m_changed, sender=Event.black_list.through)
+def invalidate_event_cache_after_black_list_change(
+    sender: Any, instance: Union[Event, User], **kwargs: Any
+) -> None:
+    event_ids: Optional[list[int]] = get_changed_events_ids(sender, instance, **kwargs)
+    if event_ids is not None:
+        invalidate_events_cache(event_ids=event_ids)
+
+
+@receiver(pre_delete, sender=User)
+def update_event_members_count_before_user_delete(
+    sender: User, instance: User, **kwargs: Any
+) -> None:
+    Event.objects.filter(current_users=instance).update(
+        count_current_users=F("count_current_users") - 1
+    )
+    Event.objects.filter(current_fans=instance).update(
+        count_current_fans=F("count_current_fans") - 1
+    )
+    invalidate_events_cache(
+        event_ids=Event.objects.filter(
+            Q(current_users=instance)
+            | Q(current_fans=instance)
+            | Q(black_list=instance)
+        ).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Event)
+def update_event_search_vector_after_save(
+    sender: Event,
+    instance: Event,
+    created: bool,
+    update_fields: Optional[frozenset[str]],
+    **kwargs: Any,
+) -> None:
+    if created or update_fields is None or EVENT_SEARCH_FIELDS & update_fields:
+        update_events_search_vector(event_ids=[instance.id])
+
+
+@receiver(post_save, sender=Event)
+def invalidate_event_cache_after_save(
+    sender: Event, instance: Event, **kwargs: Any
+) -> None:
+    invalidate_events_cache(event_ids=[instance.id])
+
+
 @receiver(post_save, sender=Event)
 def send_message_the_end_of_event(sender: Event, instance: Event, **kwargs) -> None:
     if instance.status == instance.Status.FINISHED:
@@ -72,6 +166,8 @@ def send_message_the_end_of_event(sender: Event, instance: Event, **kwargs) -> N
                 "event": {
                     "id": instance.id,
                     "name": instance.name,
+                    # delivered after the marking of the event notifications
+                    "finished": True,
                 }
             },
         )
@@ -83,58 +179,44 @@ def delete_all_event_relations_after_finished(
 ) -> None:
     if instance.status == instance.Status.FINISHED:
         instance.invites.all().delete()
-        for notification in Notification.objects.filter(data__event__id=instance.id):
-            notification.data["event"].update({"finished": True})
-            notification.save()
+        mark_event_notifications_finished(event_id=instance.id)
 
 
-@receiver(pre_delete, sender=Event)
-def delete_event(sender: Event, instance: Event, **kwargs) -> None:
-    send_notification_to_subscribe_event_user(
-        event=instance, message_type=EVENT_DELETE_NOTIFICATION_TYPE
-    )
-
-
-def send_update_message_after_response(
-    *, instance: Union[InviteToEvent, RequestToParticipation], message_type: str
+@receiver(pre_delete, sender=User)
+def notify_event_subscribers_before_user_delete(
+    sender: User, instance: User, **kwargs: Any
 ) -> None:
-    if instance.status != instance.Status.WAITING:
-        try:
-            status: dict[str, bool] = {
-                instance.Status.ACCEPTED: True,
-                instance.Status.DECLINED: False,
-            }
-            notification = Notification.objects.get(
-                message_type=INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
-                data__invite__id=instance.id,
-            )
-            send(
-                user=instance.recipient,
-                data={
-                    "type": "kafka.message",
-                    "message": {
-                        "message_type": message_type,
-                        "notification": {
-                            "id": notification.id,
-                            "message_type": notification.message_type,
-                            "response": status[instance.status],
-                        },
-                    },
-                },
+    """
+    the events of the user are removed with them by the cascade, so their
+    participants and fans are resolved and notified by one batch before it
+    """
+    event_ids: set[int] = set(
+        Event.objects.filter(author_id=instance.id).values_list("id", flat=True)
+    )
+    if not event_ids:
+        return
+    invalidate_events_cache(event_ids=event_ids)
+    notifications: list[tuple[int, dict[str, Any]]] = [
+        (user_id, data)
+        for user_id, data in deleted_events_notifications(event_ids=event_ids)
+        if user_id != instance.id
+    ]
+    if notifications:
+        transaction.on_commit(
+            lambda: send_notifications_to_users.delay(
+                message_type=EVENT_DELETE_NOTIFICATION_TYPE,
+                notifications=notifications,
             )
-            notification.data.update({"response": status[instance.status]})
-            notification.save()
-
-        except Notification.DoesNotExist:
-            pass
+        )
 
 
 @receiver(post_save, sender=InviteToEvent)
 def send_message_after_response_to_invite_to_event(
     sender: InviteToEvent, instance: InviteToEvent, **kwargs: Any
 ) -> None:
-    send_update_message_after_response(
-        instance=instance, message_type=UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT
+    send_update_messages_after_response(
+        instances=[instance],
+        message_type=UPDATE_MESSAGE_ACCEPT_OR_DECLINE_INVITE_TO_EVENT,
     )
 
 
@@ -142,8 +224,8 @@ def send_message_after_response_to_invite_to_event(
 def send_message_after_response_to_request_to_participation(
     sender: RequestToParticipation, instance: RequestToParticipation, **kwargs: Any
 ) -> None:
-    send_update_message_after_response(
-        instance=instance,
+    send_update_messages_after_response(
+        instances=[instance],
         message_type=UPDATE_MESSAGE_ACCEPT_OR_DECLINE_REQUEST_TO_PARTICIPATION,
     )
 
@@ -1,44 +1,76 @@
+from typing import Any
+
+from authentication.models import User
 from config.celery import app
 from django.db.models import Q
-from django.utils import timezone
-from events.constant.notification_types import (
-    EVENT_TIME_NOTIFICATION_TYPE,
-)
 from events.models import Event
-from events.services import (
-    send_notification_to_subscribe_event_user,
+from notifications.tasks import (
+    send_notifications_to_users,
 )
 
+EVENT_NOTIFICATIONS_CHUNK_SIZE: int = 500
+
 
 @app.task
 def check_event_start_time() -> None:
-    for event in Event.get_all().filter(~Q(status=Event.Status.FINISHED)):
-        if event.date_and_time - timezone.now() == timezone.timedelta(minutes=1440):
-            send_notification_to_subscribe_event_user(
-                event=event,
-                message_type=EVENT_TIME_NOTIFICATION_TYPE,
-                start_time=str(event.date_and_time),
-                time_to_start=1440,
-            )
-        elif event.date_and_time - timezone.now() == timezone.timedelta(minutes=120):
-            send_notification_to_subscribe_event_user(
-                event=event,
-                message_type=EVENT_TIME_NOTIFICATION_TYPE,
-                start_time=str(event.date_and_time),
-                time_to_start=120,
-            )
-        elif event.date_and_time - timezone.now() == timezone.timedelta(minutes=10):
-            send_notification_to_subscribe_event_user(
-                event=event,
-                message_type=EVENT_TIME_NOTIFICATION_TYPE,
-                start_time=str(event.date_and_time),
-                time_to_start=10,
+    # the services schedule the tasks of this module
+    from events.services import (
+        run_due_event_actions,
+    )
+
+    run_due_event_actions()
+
+
+@app.task(
+    ignore_result=True,
+    time_limit=60,
+    soft_time_limit=55,
+    default_retry_delay=5,
+)
+def send_notification_to_event_users(
+    *,
+    event_id: int,
+    message_type: str,
+    data: dict[str, Any],
+    fans: bool = False,
+    author: bool = False,
+    recipient: bool = False,
+) -> None:
+    """
+    fan-out of the event notification: the participants, and optionally
+    the fans and the author, are resolved with their profiles by one
+    query and notified by the chunks of EVENT_NOTIFICATIONS_CHUNK_SIZE
+    users in the separate jobs
+    """
+    users: Q = Q(
+        id__in=Event.current_users.through.objects.filter(event_id=event_id).values(
+            "user_id"
+        )
+    )
+    if fans:
+        users |= Q(
+            id__in=Event.current_fans.through.objects.filter(event_id=event_id).values(
+                "user_id"
             )
-        elif event.date_and_time == timezone.now():
-            event.status = event.Status.ACTIVE
-            event.save()
-        elif (
-            (event.date_and_time - timezone.now()) / timezone.timedelta(days=1)
-        ) * 1440 + event.duration <= 0:
-            event.status = event.Status.FINISHED
-            event.save()
+        )
+    if author:
+        users |= Q(id__in=Event.objects.filter(id=event_id).values("author_id"))
+    notifications: list[tuple[int, dict[str, Any]]] = [
+        (
+            user_id,
+            {
+                "recipient": {"id": user_id, "name": name, "last_name": last_name},
+                **data,
+            }
+            if recipient
+            else data,
+        )
+        for user_id, name, last_name in User.objects.filter(users)
+        .order_by("id")
+        .values_list("id", "profile__name", "profile__last_name")
+    ]
+    for index in range(0, len(notifications), EVENT_NOTIFICATIONS_CHUNK_SIZE):
+        send_notifications_to_users.delay(
+            message_type=message_type,
+            notifications=notifications[index : index + EVENT_NOTIFICATIONS_CHUNK_SIZE],
+        )
@@ -1,10 +1,19 @@
 from collections import OrderedDict
+from types import NoneType
 
+from authentication.models import User
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+from django.urls import reverse
+from events.models import Event
+from freezegun import freeze_time
+from rest_framework.status import HTTP_201_CREATED
 from rest_framework.test import APITestCase
 
 
 class SetUpEventsViews(APITestCase):
     def setUp(self) -> OrderedDict:
+        cache.clear()
         self.event_create_data = {
             "name": "string",
             "description": "string",
@@ -96,3 +105,27 @@ class SetUpEventsViews(APITestCase):
             },
         }
         self.fan_event_join_data = {"event_id": 0}
+
+    @freeze_time("2022-9-29")
+    def create_events(self, count: int) -> QuerySet[Event]:
+        self.auth()
+        for create_event in range(count):
+            event_create = self.client.post(
+                reverse("event-create"), self.event_create_data
+            )
+            self.assertEqual(event_create.status_code, HTTP_201_CREATED)
+        self.assertEqual(Event.objects.count(), count)
+        return Event.objects.all()
+
+    def register_second_user(self) -> NoneType:
+        self.client.force_authenticate(None)
+        register = self.client.post(reverse("register"), self.user_reg_data_2)
+        self.assertEqual(register.status_code, HTTP_201_CREATED)
+        return self.client.force_authenticate(
+            User.objects.get(email=self.user_reg_data_2["email"])
+        )
+
+    def auth(self) -> NoneType:
+        self.client.post(reverse("register"), self.user_reg_data)
+        user = User.objects.get(email=self.user_reg_data["email"])
+        return self.client.force_authenticate(user)
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from authentication.models import Profile, User
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+from events.models import Event
+from events.services import claim_event_seat
+
+
+class TestClaimEventSeat(TransactionTestCase):
+    users_count: int = 30
+
+    def setUp(self) -> None:
+        self.author: User = self.create_user(0)
+        self.event: Event = Event.objects.create(
+            author=self.author,
+            name="string",
+            description="string",
+            place="string",
+            gender="Man",
+            date_and_time=timezone.now() + timezone.timedelta(days=1),
+            need_ball=True,
+            amount_members=6,
+            type="Football",
+            need_form=True,
+            privacy=False,
+            duration=10,
+            forms="Shirt-Front",
+        )
+        self.users: list[User] = [
+            self.create_user(number) for number in range(1, self.users_count + 1)
+        ]
+
+    def test_concurrent_joins_do_not_overfill_event(self) -> None:
+        barrier: Barrier = Barrier(self.users_count)
+
+        def join(user: User) -> bool:
+            try:
+                barrier.wait()
+                return claim_event_seat(event=self.event, user=user)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.users_count) as executor:
+            results: list[bool] = list(executor.map(join, self.users))
+
+        self.event.refresh_from_db()
+        self.assertEqual(results.count(True), self.event.amount_members)
+        self.assertEqual(self.event.current_users.count(), self.event.amount_members)
+        self.assertEqual(self.event.count_current_users, self.event.amount_members)
+
+    def test_claim_seat_in_finished_event(self) -> None:
+        Event.objects.filter(id=self.event.id).update(status=Event.Status.FINISHED)
+        self.assertFalse(claim_event_seat(event=self.event, user=self.users[0]))
+        self.assertEqual(self.event.current_users.count(), 0)
+
+    def create_user(self, number: int) -> User:
+        return User.objects.create_user(
+            email=f"user{number}@example.com",
+            phone=f"+3806838619{number:02}",
+            password="string11",
+            profile=Profile.objects.create(
+                name="string", last_name="string", gender="Man"
+            ),
+        )
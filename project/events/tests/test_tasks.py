@@ -0,0 +1,210 @@
+from contextlib import contextmanager
+from datetime import datetime
+from io import StringIO
+from typing import Any, Iterator
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from authentication.models import User
+from channels.layers import get_channel_layer
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from events import services
+from events.constant.notification_types import (
+    EVENT_HAS_BEEN_ENDEN_NOTIFICATION_TYPE,
+    EVENT_TIME_NOTIFICATION_TYPE,
+    EVENT_UPDATE_NOTIFICATION_TYPE,
+    UPDATE_MESSAGE_EVENT_FINISHED,
+)
+from events.models import Event
+from events.tasks import (
+    check_event_start_time,
+    send_notification_to_event_users,
+)
+from freezegun import freeze_time
+from notifications.models import (
+    Notification,
+    NotificationOutbox,
+)
+from notifications.tasks import (
+    drain_notifications_outbox,
+    send_notifications_to_users,
+)
+from rest_framework.status import HTTP_200_OK
+
+from .set_up import SetUpEventsViews
+
+
+@contextmanager
+def run_notification_tasks() -> Iterator[None]:
+    """the notification jobs are run by the test instead of the workers"""
+    with patch.object(
+        send_notification_to_event_users, "delay", send_notification_to_event_users
+    ), patch.object(send_notifications_to_users, "delay", send_notifications_to_users):
+        yield
+
+
+class TestEventsTasks(SetUpEventsViews):
+    @freeze_time("2022-9-29")
+    def test_event_next_action_after_create(self) -> None:
+        self.create_events(1)
+        event: Event = Event.objects.first()
+        self.assertEqual(event.next_action, Event.ScheduledAction.REMIND)
+        self.assertEqual(
+            event.next_action_time,
+            event.date_and_time - timezone.timedelta(minutes=1440),
+        )
+
+    def test_event_reminder(self) -> None:
+        self.create_events(1)
+        self.join_second_user()
+        event: Event = Event.objects.first()
+        with freeze_time(event.next_action_time), run_notification_tasks():
+            with self.captureOnCommitCallbacks(execute=True):
+                check_event_start_time()
+                check_event_start_time()
+        notifications = Notification.objects.filter(
+            message_type=EVENT_TIME_NOTIFICATION_TYPE
+        )
+        self.assertEqual(notifications.count(), 1)
+        self.assertEqual(notifications[0].data["event"]["time_to_start"], 1440)
+        self.assertEqual(
+            Event.objects.first().next_action_time,
+            event.date_and_time - timezone.timedelta(minutes=120),
+        )
+
+    def test_event_activate_and_finish(self) -> None:
+        self.create_events(1)
+        self.join_second_user()
+        event: Event = Event.objects.first()
+        with freeze_time(event.date_and_time):
+            check_event_start_time()
+        self.assertEqual(Event.objects.first().status, Event.Status.ACTIVE)
+        self.assertEqual(
+            Notification.objects.filter(
+                message_type=EVENT_TIME_NOTIFICATION_TYPE
+            ).count(),
+            0,
+        )
+        # the messages of the previous steps are never delivered in the test
+        NotificationOutbox.objects.all().delete()
+        channel_layer = get_channel_layer()
+        channel_name: str = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(event.author.group_name, channel_name)
+        with freeze_time(
+            event.date_and_time + timezone.timedelta(minutes=event.duration)
+        ), run_notification_tasks():
+            with self.captureOnCommitCallbacks(execute=True):
+                check_event_start_time()
+            drain_notifications_outbox()
+            message: dict[str, Any] = async_to_sync(channel_layer.receive)(channel_name)
+        event.refresh_from_db()
+        self.assertEqual(event.status, Event.Status.FINISHED)
+        self.assertIsNone(event.next_action_time)
+        self.assertEqual(
+            Notification.objects.filter(
+                message_type=EVENT_HAS_BEEN_ENDEN_NOTIFICATION_TYPE
+            ).count(),
+            2,
+        )
+        self.assertTrue(
+            all(
+                data["event"]["finished"]
+                for data in Notification.objects.filter(event_id=event.id).values_list(
+                    "data", flat=True
+                )
+            )
+        )
+        self.assertEqual(
+            message["message"],
+            {
+                "message_type": UPDATE_MESSAGE_EVENT_FINISHED,
+                "event": {"id": event.id, "finished": True},
+            },
+        )
+
+    def test_event_search_vector_is_kept_by_scheduler(self) -> None:
+        self.create_events(1)
+        event: Event = Event.objects.first()
+        self.assertIsNotNone(event.search_vector)
+        with freeze_time(event.date_and_time), patch(
+            "events.signals.update_events_search_vector"
+        ) as update_events_search_vector:
+            check_event_start_time()
+        update_events_search_vector.assert_not_called()
+        event.refresh_from_db()
+        self.assertEqual(event.status, Event.Status.ACTIVE)
+        self.assertEqual(event.next_action, Event.ScheduledAction.FINISH)
+
+    def test_failed_event_action_is_skipped(self) -> None:
+        self.create_events(2)
+        broken, event = Event.objects.order_by("id")
+        run_event_scheduled_action = services.run_event_scheduled_action
+
+        def run_action(*, event: Event, now: datetime) -> None:
+            run_event_scheduled_action(event=event, now=now)
+            if event.id == broken.id:
+                raise ValueError
+
+        with freeze_time(event.date_and_time), patch.object(
+            services, "run_event_scheduled_action", side_effect=run_action
+        ), self.assertLogs(services.logger, "ERROR"):
+            check_event_start_time()
+        broken.refresh_from_db()
+        event.refresh_from_db()
+        self.assertEqual(broken.next_action, Event.ScheduledAction.REMIND)
+        self.assertEqual(broken.status, Event.Status.PLANNED)
+        self.assertEqual(event.status, Event.Status.ACTIVE)
+
+    def test_event_users_notification_fan_out(self) -> None:
+        self.create_events(1)
+        self.join_second_user()
+        event: Event = Event.objects.first()
+        event.author.current_views_rooms.add(event)
+        with patch(
+            "events.tasks.EVENT_NOTIFICATIONS_CHUNK_SIZE", 1
+        ), run_notification_tasks():
+            send_notification_to_event_users(
+                event_id=event.id,
+                message_type=EVENT_UPDATE_NOTIFICATION_TYPE,
+                data={"event": {"id": event.id}},
+                fans=True,
+                author=True,
+                recipient=True,
+            )
+        notifications = Notification.objects.filter(
+            message_type=EVENT_UPDATE_NOTIFICATION_TYPE
+        ).order_by("user_id")
+        self.assertEqual(
+            [notification.data["recipient"]["id"] for notification in notifications],
+            sorted(
+                [
+                    event.author_id,
+                    User.objects.get(email=self.user_reg_data_2["email"]).id,
+                ]
+            ),
+        )
+        self.assertEqual(notifications[0].data["event"], {"id": event.id})
+
+    def test_reconcile_events_members_count(self) -> None:
+        self.create_events(2)
+        self.join_second_user()
+        Event.objects.update(count_current_users=10, count_current_fans=10)
+        call_command("reconcile_events_members_count", stdout=StringIO())
+        self.assertEqual(
+            list(
+                Event.objects.order_by("id").values_list(
+                    "count_current_users", "count_current_fans"
+                )
+            ),
+            [(1, 0), (0, 0)],
+        )
+
+    @freeze_time("2022-9-29")
+    def join_second_user(self) -> None:
+        self.register_second_user()
+        response = self.client.post(
+            reverse("join-to-event"), {"event_id": Event.objects.first().id}
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
@@ -1,14 +1,27 @@
-from types import NoneType
+from unittest.mock import patch
 
 from authentication.models import User
-from django.db.models.query import QuerySet
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+)
 from django.urls import reverse
+from events.constant.notification_types import (
+    EVENT_DELETE_NOTIFICATION_TYPE,
+    INVITE_USER_TO_EVENT_NOTIFICATION_TYPE,
+    RESPONSE_TO_THE_INVITE_TO_EVENT_NOTIFICATION_TYPE,
+    RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE,
+)
 from events.models import (
     Event,
+    InviteToEvent,
     RequestToParticipation,
 )
 from freezegun import freeze_time
 from notifications.models import Notification
+from notifications.tasks import (
+    send_notifications_to_users,
+)
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
@@ -146,6 +159,93 @@ class TestEventsViews(SetUpEventsViews):
         self.assertEqual(get_user_events_list_2.data["total_count"], 0)
         self.assertEqual(get_user_events_list_2.status_code, HTTP_200_OK)
 
+    @freeze_time("2022-9-29")
+    def test_events_list_query_count_does_not_depend_on_page_size(self) -> None:
+        self.create_events(1)
+        with CaptureQueriesContext(connection) as one_event_queries:
+            self.client.get(reverse("events-list"))
+        for create_event in range(5):
+            self.client.post(reverse("event-create"), self.event_create_data)
+        self.register_second_user()
+        for event in Event.objects.all():
+            self.client.post(reverse("join-to-event"), {"event_id": event.id})
+        with CaptureQueriesContext(connection) as many_events_queries:
+            response = self.client.get(reverse("events-list"))
+        self.assertEqual(response.data["total_count"], 6)
+        self.assertEqual(response.data["results"][0]["count_current_users"], 1)
+        self.assertEqual(len(one_event_queries), len(many_events_queries))
+
+    @freeze_time("2022-9-29")
+    def test_events_list_cursor_pagination(self) -> None:
+        self.create_events(15)
+        first_page = self.client.get(reverse("events-list"), {"cursor": ""})
+        self.assertEqual(first_page.status_code, HTTP_200_OK)
+        self.assertIsNone(first_page.data["total_count"])
+        with CaptureQueriesContext(connection) as queries:
+            second_page = self.client.get(first_page.data["next"])
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+        self.assertIsNone(second_page.data["next"])
+        self.assertEqual(
+            [event["id"] for event in first_page.data["results"]]
+            + [event["id"] for event in second_page.data["results"]],
+            list(Event.objects.order_by("-id").values_list("id", flat=True)),
+        )
+        bad_cursor = self.client.get(reverse("events-list"), {"cursor": "bad"})
+        self.assertEqual(bad_cursor.status_code, HTTP_404_NOT_FOUND)
+
+    @freeze_time("2022-9-29")
+    def test_events_list_full_text_search(self) -> None:
+        self.auth()
+        for name, date_and_time in (
+            ("Evening football", "2022-9-30T10:44:32.275Z"),
+            ("Morning football", "2022-10-5T10:44:32.275Z"),
+            ("Volleyball", "2022-9-30T10:44:32.275Z"),
+        ):
+            self.client.post(
+                reverse("event-create"),
+                self.event_create_data | {"name": name, "date_and_time": date_and_time},
+            )
+        response = self.client.get(reverse("events-list"), {"search": "footballs"})
+        self.assertEqual(response.data["total_count"], 2)
+        response = self.client.get(
+            reverse("events-list"),
+            {"search": "football", "date_and_time_before": "2022-10-1"},
+        )
+        self.assertEqual(
+            [event["name"] for event in response.data["results"]], ["Evening football"]
+        )
+        update = self.client.put(
+            reverse(
+                "update-event", kwargs={"pk": Event.objects.get(name="Volleyball").id}
+            ),
+            self.event_update_data | {"name": "Beach football"},
+        )
+        self.assertEqual(update.status_code, HTTP_200_OK)
+        response = self.client.get(reverse("user-events-list"), {"search": "football"})
+        self.assertEqual(response.data["total_count"], 3)
+
+    @freeze_time("2022-9-29")
+    def test_popular_events_list(self) -> None:
+        self.auth()
+        for event_type in ("Football", "Futsal", "Futsal"):
+            self.client.post(
+                reverse("event-create"), self.event_create_data | {"type": event_type}
+            )
+        football, futsal, popular_futsal = Event.objects.order_by("id")
+        self.register_second_user()
+        self.client.post(reverse("join-to-event"), {"event_id": popular_futsal.id})
+        response = self.client.get(reverse("popular-events-list"))
+        self.assertEqual(
+            [event["id"] for event in response.data["results"]],
+            [popular_futsal.id, futsal.id, football.id],
+        )
+        response = self.client.get(reverse("popular-events-list"), {"type": "Football"})
+        self.assertEqual(
+            [event["id"] for event in response.data["results"]], [football.id]
+        )
+
     @freeze_time("2022-9-29")
     def test_bulk_delete_events(self) -> None:
         self.create_events(10)
@@ -156,6 +256,76 @@ class TestEventsViews(SetUpEventsViews):
         self.assertEqual(Event.objects.count(), 8)
         self.assertEqual(response.status_code, HTTP_200_OK)
 
+    @freeze_time("2022-9-29")
+    def test_bulk_delete_events_notifies_subscribers(self) -> None:
+        self.create_events(3)
+        event_ids: list[int] = list(Event.objects.values_list("id", flat=True))
+        self.register_second_user()
+        for event_id in event_ids:
+            self.client.post(reverse("join-to-event"), {"event_id": event_id})
+        self.client.post(reverse("spectator-join-to-event"), {"event_id": event_ids[0]})
+        self.client.force_authenticate(
+            User.objects.get(email=self.user_reg_data["email"])
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                reverse("bulk-delete-events"), {"ids": event_ids[:2] + [0]}
+            )
+        with patch.object(send_notifications_to_users, "delay") as delay:
+            for callback in callbacks:
+                callback()
+        delay.assert_called_once()
+        send_notifications_to_users(**delay.call_args.kwargs)
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            response.json()["data"],
+            [{"success": event_id} for event_id in event_ids[:2]],
+        )
+        self.assertEqual(
+            list(Event.objects.values_list("id", flat=True)), event_ids[2:]
+        )
+        self.assertEqual(
+            sorted(
+                Notification.objects.filter(
+                    message_type=EVENT_DELETE_NOTIFICATION_TYPE
+                ).values_list("event_id", flat=True)
+            ),
+            event_ids[:2],
+        )
+
+    @freeze_time("2022-9-29")
+    def test_bulk_delete_many_events_queries(self) -> None:
+        self.create_events(8)
+        event_ids: list[int] = list(Event.objects.values_list("id", flat=True))
+        with CaptureQueriesContext(connection) as few_events_queries:
+            self.client.post(reverse("bulk-delete-events"), {"ids": event_ids[:2]})
+        with CaptureQueriesContext(connection) as many_events_queries:
+            self.client.post(reverse("bulk-delete-events"), {"ids": event_ids[2:]})
+        self.assertFalse(Event.objects.exists())
+        self.assertEqual(len(few_events_queries), len(many_events_queries))
+
+    @freeze_time("2022-9-29")
+    def test_delete_author_notifies_event_subscribers(self) -> None:
+        self.create_events(2)
+        event_ids: list[int] = list(Event.objects.values_list("id", flat=True))
+        self.register_second_user()
+        for event_id in event_ids:
+            self.client.post(reverse("join-to-event"), {"event_id": event_id})
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.filter(email=self.user_reg_data["email"]).delete()
+        with patch.object(send_notifications_to_users, "delay") as delay:
+            for callback in callbacks:
+                callback()
+        delay.assert_called_once()
+        self.assertEqual(
+            sorted(
+                data["event"]["id"]
+                for _, data in delay.call_args.kwargs["notifications"]
+            ),
+            event_ids,
+        )
+        self.assertFalse(Event.objects.exists())
+
     @freeze_time("2022-9-29")
     def test_no_author_bulk_delete_events(self) -> None:
         self.create_events(10)
@@ -186,6 +356,28 @@ class TestEventsViews(SetUpEventsViews):
         )
         self.assertEqual(response.status_code, HTTP_200_OK)
 
+    @freeze_time("2022-9-29")
+    def test_get_event_cache(self) -> None:
+        event: Event = self.create_events(1)[0]
+        author: User = User.objects.get(email=self.user_reg_data["email"])
+        self.client.get(reverse("get-event", kwargs={"pk": event.id}))
+        with self.assertNumQueries(0):
+            get_event = self.client.get(reverse("get-event", kwargs={"pk": event.id}))
+        self.assertEqual(get_event.data["count_current_users"], 0)
+        self.register_second_user()
+        second_user: User = User.objects.get(email=self.user_reg_data_2["email"])
+        self.client.post(reverse("join-to-event"), {"event_id": event.id})
+        get_event = self.client.get(reverse("get-event", kwargs={"pk": event.id}))
+        self.assertEqual(get_event.data["count_current_users"], 1)
+        self.client.force_authenticate(author)
+        self.client.post(
+            reverse("remove-user-from-event"),
+            {"user_id": second_user.id, "event_id": event.id, "reason": "string"},
+        )
+        self.client.force_authenticate(second_user)
+        get_event = self.client.get(reverse("get-event", kwargs={"pk": event.id}))
+        self.assertEqual(get_event.status_code, HTTP_403_FORBIDDEN)
+
     @freeze_time("2022-9-29")
     def test_no_author_update_event(self) -> None:
         self.create_events(1)
@@ -220,6 +412,70 @@ class TestEventsViews(SetUpEventsViews):
         )
         self.assertEqual(response.status_code, HTTP_200_OK)
 
+    @freeze_time("2022-9-29")
+    def test_accept_invites_to_event(self) -> None:
+        self.create_events(1)
+        self.register_second_user()
+        second_user: User = User.objects.get(email=self.user_reg_data_2["email"])
+        self.client.force_authenticate(
+            User.objects.get(email=self.user_reg_data["email"])
+        )
+        self.client.post(
+            reverse("invite-to-event"),
+            {"user_id": second_user.id, "event_id": Event.objects.first().id},
+        )
+        invite: InviteToEvent = InviteToEvent.objects.get()
+        self.client.force_authenticate(second_user)
+        response = self.client.post(
+            reverse("accept-decline-invites-to-event"),
+            {"ids": [invite.id, invite.id, 0], "type": True},
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.json()["data"], [{"success": invite.id}])
+        self.assertEqual(InviteToEvent.objects.get().status, invite.Status.ACCEPTED)
+        self.assertEqual(Event.objects.first().count_current_users, 1)
+        self.assertTrue(
+            Notification.objects.get(
+                message_type=INVITE_USER_TO_EVENT_NOTIFICATION_TYPE
+            ).data["response"]
+        )
+        self.assertEqual(
+            Notification.objects.get(
+                message_type=RESPONSE_TO_THE_INVITE_TO_EVENT_NOTIFICATION_TYPE
+            ).user.email,
+            self.user_reg_data["email"],
+        )
+
+    @freeze_time("2022-9-29")
+    def test_accept_requests_to_participation(self) -> None:
+        self.auth()
+        self.event_create_data["privacy"] = True
+        self.client.post(reverse("event-create"), self.event_create_data)
+        self.register_second_user()
+        self.client.post(
+            reverse("join-to-event"), {"event_id": Event.objects.first().id}
+        )
+        request_to_p: RequestToParticipation = RequestToParticipation.objects.get()
+        self.client.force_authenticate(
+            User.objects.get(email=self.user_reg_data["email"])
+        )
+        response = self.client.post(
+            reverse("accept-decline-participations"),
+            {"ids": [request_to_p.id], "type": True},
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            RequestToParticipation.objects.get().status,
+            request_to_p.Status.ACCEPTED,
+        )
+        self.assertEqual(Event.objects.first().count_current_users, 1)
+        self.assertEqual(
+            Notification.objects.get(
+                message_type=RESPONSE_TO_THE_REQUEST_FOR_PARTICIPATION_NOTIFICATION_TYPE
+            ).user.email,
+            self.user_reg_data_2["email"],
+        )
+
     @freeze_time("2022-9-29")
     def test_author_invites_himself(self) -> None:
         self.create_events(1)
@@ -318,27 +574,3 @@ class TestEventsViews(SetUpEventsViews):
         )
         self.assertEqual(Event.objects.first().count_current_users, 1)
         self.assertEqual(event_join.status_code, HTTP_200_OK)
-
-    @freeze_time("2022-9-29")
-    def create_events(self, count: int) -> QuerySet[Event]:
-        self.auth()
-        for create_event in range(count):
-            event_create = self.client.post(
-                reverse("event-create"), self.event_create_data
-            )
-            self.assertEqual(event_create.status_code, HTTP_201_CREATED)
-        self.assertEqual(Event.objects.count(), count)
-        return Event.objects.all()
-
-    def register_second_user(self) -> NoneType:
-        self.client.force_authenticate(None)
-        register = self.client.post(reverse("register"), self.user_reg_data_2)
-        self.assertEqual(register.status_code, HTTP_201_CREATED)
-        return self.client.force_authenticate(
-            User.objects.get(email=self.user_reg_data_2["email"])
-        )
-
-    def auth(self) -> NoneType:
-        self.client.post(reverse("register"), self.user_reg_data)
-        user = User.objects.get(email=self.user_reg_data["email"])
-        return self.client.force_authenticate(user)
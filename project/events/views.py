@@ -1,4 +1,4 @@
-from typing import Any, Type, final
+from typing import Any, Optional, Type, final
 
 from authentication.constant.errors import (
     NO_SUCH_USER_ERROR,
@@ -7,8 +7,13 @@ from authentication.filters import (
     RankedFuzzySearchFilter,
 )
 from config.exceptions import _404
-from config.yasg import skip_param
-from django.db.models import Count, Q
+from config.pagination import (
+    CustomCursorPagination,
+    CustomPagination,
+)
+from config.yasg import cursor_param, skip_param
+from django.core.cache import cache
+from django.db.models import Q
 from django.db.models.query import QuerySet
 from django.utils.decorators import (
     method_decorator,
@@ -25,6 +30,7 @@ from events.constant.response_error import (
     ALREADY_IN_EVENT_MEMBERS_LIST_ERROR,
     EVENT_AUTHOR_CAN_NOT_JOIN_ERROR,
     EVENT_NOT_FOUND_ERROR,
+    NO_EVENT_PLACE_ERROR,
     NO_IN_EVENT_FANS_LIST_ERROR,
     NO_IN_EVENT_MEMBERS_LIST_ERROR,
 )
@@ -38,6 +44,8 @@ from events.constant.response_success import (
 )
 from events.filters import (
     EventDateTimeRangeFilter,
+    EventsFullTextSearchFilter,
+    PopularEventsFilter,
 )
 from events.models import (
     Event,
@@ -59,27 +67,30 @@ from events.serializers import (
     UpdateEventSerializer,
 )
 from events.services import (
+    EVENT_CACHE_TIMEOUT,
     bulk_accept_or_decline_invites_to_events,
     bulk_accpet_or_decline_requests_to_participation,
     bulk_delete_events,
+    claim_event_seat,
+    event_cache_key,
     event_create,
     filter_event_by_user_planned_events_time,
+    invalidate_events_cache,
     not_in_black_list,
     only_author,
     remove_user_from_event,
     send_notification_to_event_author,
     send_notification_to_subscribe_event_user,
     skip_objects_from_response_by_id,
+    update_event_schedule,
+    update_events_search_vector,
     validate_user_before_join_to_event,
 )
 from notifications.tasks import *
 from rest_framework.exceptions import (
     PermissionDenied,
 )
-from rest_framework.filters import (
-    OrderingFilter,
-    SearchFilter,
-)
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import (
     GenericAPIView,
     ListAPIView,
@@ -130,7 +141,10 @@ class InviteUserToEvent(GenericAPIView):
 
 
 class GetEvent(RetrieveModelMixin, GenericAPIView):
-    """a class that allows you to get an event"""
+    """
+    a class that allows you to get an event,
+    the representation is cached until the event changes
+    """
 
     serializer_class: Type[Serializer] = EventSerializer
     queryset: QuerySet[Event] = Event.get_all()
@@ -139,6 +153,15 @@ class GetEvent(RetrieveModelMixin, GenericAPIView):
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
+    def retrieve(
+        self, request: Request, pk: int, *args: Any, **kwargs: Any
+    ) -> Response:
+        data: Optional[dict[str, Any]] = cache.get(event_cache_key(pk))
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(event_cache_key(pk), data, EVENT_CACHE_TIMEOUT)
+        return Response(data)
+
 
 class UpdateEvent(GenericAPIView):
     serializer_class: Type[Serializer] = UpdateEventSerializer
@@ -153,6 +176,9 @@ class UpdateEvent(GenericAPIView):
             event=event[0], message_type=EVENT_UPDATE_NOTIFICATION_TYPE
         )
         event.update(**serializer.validated_data)
+        update_event_schedule(event=Event.objects.get(id=pk))
+        update_events_search_vector(event_ids=[pk])
+        invalidate_events_cache(event_ids=[pk])
         return Response(EVENT_UPDATE_SUCCESS, status=HTTP_200_OK)
 
 
@@ -183,7 +209,8 @@ class JoinToEvent(GenericAPIView):
         event: Event = Event.objects.get(id=serializer.data["event_id"])
         validate_user_before_join_to_event(user=user, event=event)
         if not event.privacy:
-            user.current_rooms.add(event)
+            if not claim_event_seat(event=event, user=user):
+                raise ValidationError(NO_EVENT_PLACE_ERROR, HTTP_400_BAD_REQUEST)
             send_notification_to_event_author(event=event, request_user=request.user)
             return Response(JOIN_TO_EVENT_SUCCESS, status=HTTP_200_OK)
         RequestToParticipation.objects.create(
@@ -274,7 +301,9 @@ class RemoveUserFromEvent(GenericAPIView):
         return Response(USER_REMOVED_FROM_EVENT_SUCCESS, status=HTTP_200_OK)
 
 
-@method_decorator(swagger_auto_schema(manual_parameters=[skip_param]), name="get")
+@method_decorator(
+    swagger_auto_schema(manual_parameters=[skip_param, cursor_param]), name="get"
+)
 class EventsList(ListAPIView):
     """class that allows you to get a complete list of events"""
 
@@ -282,21 +311,15 @@ class EventsList(ListAPIView):
     filter_backends = [
         DjangoFilterBackend,
         OrderingFilter,
-        SearchFilter,
-    ]
-    search_fields: list[str] = [
-        "id",
-        "name",
-        "price",
-        "place",
-        "date_and_time",
-        "amount_members",
+        EventsFullTextSearchFilter,
     ]
     ordering_fields: list[str] = [
         "id",
     ]
     filterset_class = EventDateTimeRangeFilter
-    queryset: QuerySet[Event] = Event.get_all()
+    pagination_class = CustomCursorPagination
+    # the list only needs the denormalized members counters
+    queryset: QuerySet[Event] = Event.get_all().prefetch_related(None)
 
     @skip_objects_from_response_by_id
     def get_queryset(self) -> QuerySet[Event]:
@@ -307,7 +330,7 @@ class EventsList(ListAPIView):
 class EventsRelevantList(ListAPIView):
     filter_backends = [RankedFuzzySearchFilter]
     serializer_class: Type[Serializer] = EventListSerializer
-    queryset: QuerySet[Event] = Event.get_all()
+    queryset: QuerySet[Event] = Event.get_all().prefetch_related(None)
     search_fields: list[str] = ["name"]
 
     @skip_objects_from_response_by_id
@@ -360,15 +383,27 @@ class UserParticipantEventsList(UserEventsList):
 
 
 class PopularEvents(UserEventsList):
+    """
+    top of the planned events by the participants counter, optionally
+    for one type or gender, read from the event_popular_* indexes
+    """
+
     serializer_class: Type[Serializer] = PopularIventsListSerializer
-    queryset: QuerySet[Event] = Event.get_all().filter(status="Planned")
+    filter_backends = [
+        DjangoFilterBackend,
+    ]
+    filterset_class = PopularEventsFilter
+    pagination_class = CustomPagination
+    queryset: QuerySet[Event] = (
+        Event.get_all().prefetch_related(None).filter(status=Event.Status.PLANNED)
+    )
+    popular_events_count: int = 10
 
     def get_queryset(self) -> QuerySet[Event]:
-        return (
-            EventsList.get_queryset(self)
-            .annotate(count=Count("current_users"))
-            .order_by("-count")[:10]
-        )
+        return EventsList.get_queryset(self).order_by("-count_current_users", "-id")
+
+    def filter_queryset(self, queryset: QuerySet[Event]) -> QuerySet[Event]:
+        return super().filter_queryset(queryset)[: self.popular_events_count]
 
 
 class UserPlannedEventsList(UserEventsList):
@@ -1,3 +1,6 @@
 CHANGE_MAINTENANCE_NOTIFICATION_TYPE: str = "change_maintenance"
 NOTIFICATION_DELETE_NOTIFICATION_TYPE: str = "notification_delete"
 NOTIFICATION_READ_NOTIFICATION_TYPE: str = "notification_read"
+NOTIFICATIONS_DELETE_NOTIFICATION_TYPE: str = "notifications_delete"
+NOTIFICATIONS_READ_NOTIFICATION_TYPE: str = "notifications_read"
+NOTIFICATIONS_REPLAYED_NOTIFICATION_TYPE: str = "notifications_replayed"
@@ -1,64 +1,154 @@
+import asyncio
 import json
 from types import NoneType
-from typing import Any, Literal, Optional
-
-from authentication.models import User
+from typing import Any, Optional
+from urllib.parse import parse_qs
+
+from authentication.presence import (
+    PRESENCE_REFRESH_INTERVAL,
+    connect_user,
+    disconnect_user,
+    refresh_user,
+)
 from channels.db import database_sync_to_async
 from channels.generic.websocket import (
     AsyncWebsocketConsumer,
 )
 from django.utils import timezone
+from notifications.constant.notification_types import (
+    CHANGE_MAINTENANCE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_REPLAYED_NOTIFICATION_TYPE,
+)
+from notifications.flags import (
+    reset_runtime_flags,
+)
+from notifications.models import Notification
+
+NOTIFICATIONS_REPLAY_LIMIT: int = 500
 
 
 class UserConsumer(AsyncWebsocketConsumer):
+    # the newest notification already sent to the client by the replay
+    replayed_notification_id: int = 0
+    # the connection is counted in the presence of the user
+    is_active: bool = False
+    presence_heartbeat: Optional[asyncio.Task] = None
+
     async def connect(self) -> None:
-        if await self.check_user():
-            self.user_group_name = await self.room_groop_name()
-            self.room_group_name = self.user_group_name
+        # the user is resolved by the token middleware
+        if self.scope["user"].is_authenticated:
+            self.room_group_name = self.scope["user"].group_name
 
             await self.channel_layer.group_add(self.room_group_name, self.channel_name)
-            if await self.check_user_group_name():
-                await self.accept()
-                await self.add_user_to_active()
-
-    @database_sync_to_async
-    def check_user(self) -> Optional[Literal[True]]:
-        user: User = User.objects.filter(email=self.scope["user"])
-        if user:
-            return True
-
-    @database_sync_to_async
-    def check_user_group_name(self) -> Optional[Literal[True]]:
-        user: User = User.objects.filter(email=self.scope["user"])
-        if user[0].group_name == self.room_group_name:
-            return True
+            await self.accept()
+            await self.add_user_to_active()
+            self.presence_heartbeat = asyncio.ensure_future(self.refresh_presence())
+            await self.replay_missed_notifications()
+        else:
+            await self.close()
+
+    def get_last_seen_notification_id(self) -> Optional[int]:
+        try:
+            return int(
+                parse_qs(self.scope["query_string"].decode())["last_notification_id"][0]
+            )
+        except (KeyError, ValueError):
+            return None
 
     @database_sync_to_async
-    def room_groop_name(self) -> User:
-        return User.objects.get(email=self.scope["user"]).group_name
+    def get_missed_notifications(
+        self, last_seen_notification_id: int
+    ) -> list[tuple[int, str, dict[str, Any]]]:
+        return list(
+            Notification.objects.filter(
+                user_id=self.scope["user"].id, id__gt=last_seen_notification_id
+            )
+            .order_by("id")
+            .values_list("id", "message_type", "data")[: NOTIFICATIONS_REPLAY_LIMIT + 1]
+        )
+
+    async def replay_missed_notifications(self) -> None:
+        """
+        streaming of the notifications created after the last seen one of
+        the client by one range read, before the switch to the live messages
+        """
+        last_seen_notification_id: Optional[int] = self.get_last_seen_notification_id()
+        if last_seen_notification_id is None:
+            return
+        notifications: list[
+            tuple[int, str, dict[str, Any]]
+        ] = await self.get_missed_notifications(last_seen_notification_id)
+        self.replayed_notification_id = last_seen_notification_id
+        for notification_id, message_type, data in notifications[
+            :NOTIFICATIONS_REPLAY_LIMIT
+        ]:
+            await self.send_message(
+                {
+                    "message": {
+                        "message_type": message_type,
+                        "notification_id": notification_id,
+                        "data": data,
+                    }
+                }
+            )
+            self.replayed_notification_id = notification_id
+        # the client refetches the list when not all notifications were replayed
+        await self.send_message(
+            {
+                "message": {
+                    "message_type": NOTIFICATIONS_REPLAYED_NOTIFICATION_TYPE,
+                    "last_notification_id": self.replayed_notification_id,
+                    "complete": len(notifications) <= NOTIFICATIONS_REPLAY_LIMIT,
+                }
+            }
+        )
 
     @database_sync_to_async
     def add_user_to_active(self) -> None:
-        self.disconnect(200)
-        user: User = User.objects.get(email=self.scope["user"])
-        user.is_online = True
-        user.save()
+        connect_user(user_id=self.scope["user"].id)
+        self.is_active = True
 
     @database_sync_to_async
     def delete_user_from_active(self) -> None:
-        user: User = User.objects.get(email=self.scope["user"])
-        user.is_online = False
-        user.save()
+        disconnect_user(user_id=self.scope["user"].id)
+
+    @database_sync_to_async
+    def refresh_user_in_active(self) -> None:
+        refresh_user(user_id=self.scope["user"].id)
+
+    async def refresh_presence(self) -> None:
+        """
+        heartbeat of the open connection, sent by the server
+        because the idle clients send no messages
+        """
+        while True:
+            await asyncio.sleep(PRESENCE_REFRESH_INTERVAL)
+            await self.refresh_user_in_active()
+
+    async def receive(
+        self, text_data: Optional[str] = None, bytes_data: Optional[bytes] = None
+    ) -> None:
+        # every message of the client is a presence heartbeat
+        await self.refresh_user_in_active()
 
     async def disconnect(self, close_code: int) -> None:
         # Leave room group
-        if await self.check_user():
+        if self.scope["user"].is_authenticated:
             await self.channel_layer.group_discard(
                 self.room_group_name, self.channel_name
             )
-            await self.delete_user_from_active()
+            if self.presence_heartbeat is not None:
+                self.presence_heartbeat.cancel()
+            if self.is_active:
+                await self.delete_user_from_active()
 
     async def kafka_message(self, event: dict[str, Any]) -> None:
+        notification_id: Optional[int] = event["message"].get("notification_id")
+        # the live messages of the already replayed notifications are skipped
+        if notification_id is None or notification_id > self.replayed_notification_id:
+            await self.send_message(event)
+
+    async def send_message(self, event: dict[str, Any]) -> None:
         # Send message to WebSocket
         text_data: bytes = json.dumps(
             {"message": event["message"], "date_time": str(timezone.now())},
@@ -75,6 +165,9 @@ class GeneralConsumer(AsyncWebsocketConsumer):
         await self.accept()
 
     async def general_message(self, event: dict[str, Any]) -> None:
+        if event["message"]["message_type"] == CHANGE_MAINTENANCE_NOTIFICATION_TYPE:
+            # the flags of this worker are refetched by the next read
+            reset_runtime_flags()
         text_data: bytes = json.dumps(
             {"message": event["message"], "date_time": str(timezone.now())},
             ensure_ascii=False,
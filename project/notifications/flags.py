@@ -0,0 +1,87 @@
+import json
+import os
+import stat
+import tempfile
+import time
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+CONFIG_FILE_PATH: str = os.path.join(settings._BASE_DIR, "config", "config.json")
+# the flags changed at runtime, shared by all the workers through the cache
+RUNTIME_FLAGS: tuple[str, ...] = ("isMaintenance",)
+# the longest time a worker serves its own copy of the flags
+RUNTIME_FLAGS_REFRESH_INTERVAL: float = 1.0
+
+_runtime_flags: dict[str, Any] = {}
+_runtime_flags_expire_at: float = 0
+
+
+def runtime_flag_key(name: str) -> str:
+    return "runtime_flag_%s" % name
+
+
+@lru_cache(maxsize=None)
+def load_config() -> dict[str, Any]:
+    """
+    the config file is read once per process and
+    read again after it was replaced by write_config
+    """
+    with open(CONFIG_FILE_PATH, "r") as f:
+        return json.load(f)
+
+
+def write_config(*, data: dict[str, Any]) -> None:
+    """
+    replacement of the config file by a fully written copy with
+    the same permissions, the readers never see a partially written file
+    """
+    fd, path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE_PATH))
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.chmod(path, stat.S_IMODE(os.stat(CONFIG_FILE_PATH).st_mode))
+        os.replace(path, CONFIG_FILE_PATH)
+    except BaseException:
+        os.unlink(path)
+        raise
+    load_config.cache_clear()
+
+
+def reset_runtime_flags() -> None:
+    global _runtime_flags_expire_at
+    _runtime_flags_expire_at = 0
+
+
+def get_runtime_flags() -> dict[str, Any]:
+    """
+    the flags are served from the memory of the process and fetched
+    from the cache by one request at most once per the refresh interval,
+    the missing flags are seeded from the config file
+    """
+    global _runtime_flags, _runtime_flags_expire_at
+    if time.monotonic() < _runtime_flags_expire_at:
+        return _runtime_flags
+    config: dict[str, Any] = load_config()
+    keys: dict[str, str] = {runtime_flag_key(name): name for name in RUNTIME_FLAGS}
+    flags: dict[str, Any] = {
+        keys[key]: value for key, value in cache.get_many(keys).items()
+    }
+    for key, name in keys.items():
+        if name not in flags:
+            cache.add(key, config[name], None)
+            flags[name] = cache.get(key, config[name])
+    _runtime_flags = {**config, **flags}
+    _runtime_flags_expire_at = time.monotonic() + RUNTIME_FLAGS_REFRESH_INTERVAL
+    return _runtime_flags
+
+
+def set_runtime_flag(*, name: str, value: Any) -> None:
+    """
+    every flag is written by one cache request, so the concurrent
+    changes of the different flags do not overwrite each other
+    """
+    cache.set(runtime_flag_key(name), value, None)
+    reset_runtime_flags()
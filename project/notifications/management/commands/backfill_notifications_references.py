@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+)
+from notifications.models import (
+    Notification,
+    fill_notifications_references,
+)
+
+
+class Command(BaseCommand):
+    help: str = "fills the event and invite reference columns of all notifications"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        updated: int = fill_notifications_references(
+            Notification.objects.all(), batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS("Notifications references filled: %s" % updated)
+        )
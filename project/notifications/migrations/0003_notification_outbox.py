@@ -0,0 +1,35 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0002_alter_notification_user"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("group_name", models.CharField(max_length=100)),
+                ("data", models.JSONField()),
+                ("time_created", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "notification outbox",
+                "verbose_name_plural": "notifications outbox",
+                "db_table": "notification_outbox",
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.1.1 on 2026-10-18 16:39
+
+from django.db import migrations, models
+from django.db.models.fields.json import (
+    KeyTextTransform,
+    KeyTransform,
+)
+from django.db.models.functions import Cast
+
+BATCH_SIZE = 10000
+
+
+def get_reference(key):
+    return Cast(
+        KeyTextTransform("id", KeyTransform(key, "data")),
+        models.BigIntegerField(),
+    )
+
+
+def backfill_notifications_references(apps, schema_editor) -> None:
+    Notification = apps.get_model("notifications", "Notification")
+    bounds = Notification.objects.aggregate(
+        first=models.Min("id"), last=models.Max("id")
+    )
+    if bounds["first"] is None:
+        return
+    for start in range(bounds["first"], bounds["last"] + 1, BATCH_SIZE):
+        Notification.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+            event_id=get_reference("event"), invite_id=get_reference("invite")
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="event_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="invite_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(
+            backfill_notifications_references, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("event_id__isnull", False)),
+                fields=["event_id"],
+                name="notification_event_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("invite_id__isnull", False)),
+                fields=["invite_id"],
+                name="notification_invite_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def notifications_count(queryset):
+    return Coalesce(
+        models.Subquery(
+            queryset.filter(user_id=models.OuterRef("user_id"))
+            .order_by()
+            .values("user_id")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def count_users_notifications(apps, schema_editor) -> None:
+    User = apps.get_model("authentication", "User")
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationsCounter = apps.get_model("notifications", "NotificationsCounter")
+    NotificationsCounter.objects.bulk_create(
+        (
+            NotificationsCounter(user_id=user_id)
+            for user_id in User.objects.values_list("id", flat=True).iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    NotificationsCounter.objects.update(
+        all_notifications_count=notifications_count(Notification.objects.all()),
+        not_read_notifications_count=notifications_count(
+            Notification.objects.filter(type="Unread")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0007_profile_search_name"),
+        ("notifications", "0004_notification_references"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationsCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="notifications_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("all_notifications_count", models.PositiveIntegerField(default=0)),
+                (
+                    "not_read_notifications_count",
+                    models.PositiveIntegerField(default=0),
+                ),
+            ],
+            options={
+                "verbose_name": "notifications counter",
+                "verbose_name_plural": "notifications counters",
+                "db_table": "notification_counter",
+            },
+        ),
+        migrations.RunPython(count_users_notifications, migrations.RunPython.noop),
+    ]
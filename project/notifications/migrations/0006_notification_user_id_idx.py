@@ -0,0 +1,17 @@
+# Generated by Django 4.1.1 on 2026-10-18 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0005_notifications_counter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["user", "id"], name="notification_user_id_idx"),
+        ),
+    ]
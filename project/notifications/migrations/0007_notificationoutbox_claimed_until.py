@@ -0,0 +1,18 @@
+# Generated by Django 4.1.1 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0006_notification_user_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationoutbox",
+            name="claimed_until",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
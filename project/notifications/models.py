@@ -1,10 +1,65 @@
 from datetime import datetime
-from typing import Any, final
+from typing import Any, Optional, final
 
 from authentication.models import User
 from django.db import models
+from django.db.models.fields.json import (
+    KeyTextTransform,
+    KeyTransform,
+)
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+)
 from django.db.models.query import QuerySet
 
+NOTIFICATION_REFERENCES: tuple[str, ...] = ("event", "invite")
+
+
+def get_notification_reference(key: str) -> Cast:
+    """id of the data[key] object of the notification as an integer"""
+    return Cast(
+        KeyTextTransform("id", KeyTransform(key, "data")),
+        models.BigIntegerField(),
+    )
+
+
+def notifications_count(queryset: QuerySet["Notification"]) -> Coalesce:
+    """count of the notifications of the queryset for the user of the outer row"""
+    return Coalesce(
+        models.Subquery(
+            queryset.filter(user_id=models.OuterRef("user_id"))
+            .order_by()
+            .values("user_id")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def fill_notifications_references(
+    queryset: QuerySet["Notification"], *, batch_size: int
+) -> int:
+    """
+    backfill of the reference columns from the data,
+    by one update statement for each range of batch_size ids
+    """
+    bounds: dict[str, Optional[int]] = queryset.aggregate(
+        first=models.Min("id"), last=models.Max("id")
+    )
+    if bounds["first"] is None:
+        return 0
+    updated: int = 0
+    for start in range(bounds["first"], bounds["last"] + 1, batch_size):
+        updated += queryset.filter(id__gte=start, id__lt=start + batch_size).update(
+            **{
+                "%s_id" % key: get_notification_reference(key)
+                for key in NOTIFICATION_REFERENCES
+            }
+        )
+    return updated
+
 
 class Notification(models.Model):
     class Type(models.TextChoices):
@@ -18,11 +73,24 @@ class Notification(models.Model):
     time_created: datetime = models.DateTimeField(auto_now_add=True)
     message_type: str = models.CharField(max_length=100)
     data: dict[str, Any] = models.JSONField()
+    event_id: int = models.BigIntegerField(null=True)
+    invite_id: int = models.BigIntegerField(null=True)
 
     @final
     def __repr__(self) -> str:
         return "<Notification %s>" % self.id
 
+    @final
+    def set_references(self) -> None:
+        """copy of the ids of the data objects to the indexed columns"""
+        for key in NOTIFICATION_REFERENCES:
+            reference: Any = (self.data or {}).get(key)
+            setattr(
+                self,
+                "%s_id" % key,
+                reference.get("id") if isinstance(reference, dict) else None,
+            )
+
     @final
     @staticmethod
     def get_all() -> QuerySet["Notification"]:
@@ -36,3 +104,58 @@ class Notification(models.Model):
         db_table: str = "notification"
         verbose_name: str = "notification"
         verbose_name_plural: str = "notifications"
+        indexes = [
+            # replay of the missed notifications of the user after a reconnect
+            models.Index(name="notification_user_id_idx", fields=["user", "id"]),
+            models.Index(
+                name="notification_event_id_idx",
+                fields=["event_id"],
+                condition=models.Q(event_id__isnull=False),
+            ),
+            models.Index(
+                name="notification_invite_id_idx",
+                fields=["invite_id"],
+                condition=models.Q(invite_id__isnull=False),
+            ),
+        ]
+
+
+class NotificationOutbox(models.Model):
+    """websocket message waiting for the delivery after the commit of its transaction"""
+
+    group_name: str = models.CharField(max_length=100)
+    data: dict[str, Any] = models.JSONField()
+    time_created: datetime = models.DateTimeField(auto_now_add=True)
+    # the message is reserved by an outbox worker until this time
+    claimed_until: Optional[datetime] = models.DateTimeField(null=True)
+
+    @final
+    def __repr__(self) -> str:
+        return "<NotificationOutbox %s>" % self.id
+
+    class Meta:
+        db_table: str = "notification_outbox"
+        verbose_name: str = "notification outbox"
+        verbose_name_plural: str = "notifications outbox"
+
+
+class NotificationsCounter(models.Model):
+    """counters of the notifications of the user, kept in step with their changes"""
+
+    user: User = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="notifications_counter",
+    )
+    all_notifications_count: int = models.PositiveIntegerField(default=0)
+    not_read_notifications_count: int = models.PositiveIntegerField(default=0)
+
+    @final
+    def __repr__(self) -> str:
+        return "<NotificationsCounter %s>" % self.user_id
+
+    class Meta:
+        db_table: str = "notification_counter"
+        verbose_name: str = "notifications counter"
+        verbose_name_plural: str = "notifications counters"
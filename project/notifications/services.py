@@ -1,4 +1,3 @@
-import json
 from typing import (
     Any,
     Generator,
@@ -9,62 +8,105 @@ from typing import (
 from asgiref.sync import async_to_sync
 from authentication.models import User
 from channels.layers import get_channel_layer
+from django.db import transaction
 from django.db.models.query import QuerySet
 from notifications.constant.notification_types import (
     CHANGE_MAINTENANCE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+)
+from notifications.flags import (
+    load_config,
+    set_runtime_flag,
+    write_config,
 )
 from notifications.models import Notification
+from notifications.tasks import (
+    decrement_notifications_counter,
+    delete_notifications,
+    send_notifications_summary_message,
+)
 
 bulk = TypeVar(Optional[Generator[list[dict[str, int]], None, None]])
 
 
 def update_maintenance(*, data: dict[str, str]) -> None:
+    set_runtime_flag(name="isMaintenance", value=data["isMaintenance"])
+    write_config(data={**load_config(), "isMaintenance": data["isMaintenance"]})
 
-    with open("./config/config.json", "r") as f:
-        json_data = json.load(f)
-        json_data["isMaintenance"] = data["isMaintenance"]
-
-    with open("./config/config.json", "w") as f:
-        f.write(json.dumps(json_data))
-
-        async_to_sync(get_channel_layer().group_send)(
-            "general",
-            {
-                "type": "general.message",
-                "message": {
-                    "message_type": CHANGE_MAINTENANCE_NOTIFICATION_TYPE,
-                    "data": {
-                        "maintenance": {
-                            "type": data["isMaintenance"],
-                        }
-                    },
+    async_to_sync(get_channel_layer().group_send)(
+        "general",
+        {
+            "type": "general.message",
+            "message": {
+                "message_type": CHANGE_MAINTENANCE_NOTIFICATION_TYPE,
+                "data": {
+                    "maintenance": {
+                        "type": data["isMaintenance"],
+                    }
                 },
             },
-        )
+        },
+    )
 
 
 def bulk_delete_notifications(
     *, data: dict[str, Any], queryset: QuerySet[Notification], user: User
 ) -> bulk:
-    for notification in data:
-        try:
-            notify = queryset.get(id=notification)
-            if notify.user == user:
-                notify.delete()
-                yield {"success": notification}
-        except Notification.DoesNotExist:
-            pass
+    """
+    deletion of the user notifications, reported
+    by one message with the deleted ids
+    """
+    with transaction.atomic():
+        notifications: dict[int, str] = dict(
+            queryset.filter(id__in=data, user_id=user.id).values_list("id", "type")
+        )
+        if notifications:
+            deleted_count: int = delete_notifications(
+                Notification.objects.filter(id__in=notifications)
+            )
+            send_notifications_summary_message(
+                user_id=user.id,
+                message_type=NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+                data={"ids": sorted(notifications)},
+                not_read_notifications_count=decrement_notifications_counter(
+                    user_id=user.id,
+                    all_count=deleted_count,
+                    not_read_count=list(notifications.values()).count(
+                        Notification.Type.UNREAD
+                    ),
+                ),
+            )
+    for notification in dict.fromkeys(data):
+        if notification in notifications:
+            yield {"success": notification}
 
 
 def bulk_read_notifications(
-    *, data: dict[str, Any], queryset: QuerySet[Notification]
+    *, data: dict[str, Any], queryset: QuerySet[Notification], user: User
 ) -> bulk:
-    for notification in data:
-        try:
-            notify = queryset.get(id=notification)
-            if notify.type != "Read":
-                notify.type = "Read"
-                notify.save()
-                yield {"success": notification}
-        except Notification.DoesNotExist:
-            pass
+    """
+    reading of the unread user notifications by one statement,
+    reported by one message with the read ids
+    """
+    with transaction.atomic():
+        notification_ids: set[int] = set(
+            queryset.filter(id__in=data, user_id=user.id)
+            .exclude(type=Notification.Type.READ)
+            .values_list("id", flat=True)
+        )
+        if notification_ids:
+            read_count: int = Notification.objects.filter(
+                id__in=notification_ids
+            ).update(type=Notification.Type.READ)
+            send_notifications_summary_message(
+                user_id=user.id,
+                message_type=NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+                data={"ids": sorted(notification_ids)},
+                not_read_notifications_count=decrement_notifications_counter(
+                    user_id=user.id, not_read_count=read_count
+                ),
+            )
+    for notification in dict.fromkeys(data):
+        if notification in notification_ids:
+            yield {"success": notification}
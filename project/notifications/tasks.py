@@ -1,15 +1,45 @@
+import asyncio
+from collections import Counter
 from datetime import datetime
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from asgiref.sync import async_to_sync
 from authentication.models import User
 from channels.layers import get_channel_layer
 from config.celery import app
-from django.db.models import QuerySet
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Max,
+    Q,
+    QuerySet,
+    When,
+)
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from notifications.constant.notification_types import (
     CHANGE_MAINTENANCE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+)
+from notifications.models import (
+    Notification,
+    NotificationOutbox,
+    NotificationsCounter,
+    notifications_count,
 )
-from notifications.models import Notification
+
+NOTIFICATIONS_OUTBOX_BATCH_SIZE: int = 500
+# longer than the time limit of the outbox worker
+NOTIFICATIONS_OUTBOX_CLAIM_TIMEOUT: timezone.timedelta = timezone.timedelta(minutes=2)
+NOTIFICATIONS_COUNTERS_BATCH_SIZE: int = 1000
+NOTIFICATIONS_OUTBOX_DRAIN_KEY: str = "notifications_outbox_drain"
+# a lost drain job is replaced after this time, the beat drains the outbox anyway
+NOTIFICATIONS_OUTBOX_DRAIN_TIMEOUT: int = 60
 
 
 @app.task(
@@ -27,20 +57,233 @@ def send_to_user(
     message_type: str,
     data: dict[str, Union[str, int, datetime, bool]] = None,
 ) -> None:
-    if message_type != CHANGE_MAINTENANCE_NOTIFICATION_TYPE:
-        notification = Notification.objects.create(
-            user=user, message_type=message_type, data=data
+    send_to_users([Notification(user=user, message_type=message_type, data=data)])
+
+
+async def group_send_messages(messages: list[tuple[str, dict[str, Any]]]) -> None:
+    channel_layer = get_channel_layer()
+    await asyncio.gather(
+        *(channel_layer.group_send(group, data) for group, data in messages)
+    )
+
+
+def send_messages(messages: list[tuple[str, dict[str, Any]]]) -> None:
+    """sending of many (group name, message) pairs by one call to the channel layer"""
+    if messages:
+        async_to_sync(group_send_messages)(messages)
+
+
+def enqueue_messages(messages: list[tuple[str, dict[str, Any]]]) -> None:
+    """
+    writing of the (group name, message) pairs to the outbox of the current
+    transaction, they are delivered by the outbox worker after the commit
+    """
+    if messages:
+        NotificationOutbox.objects.bulk_create(
+            [
+                NotificationOutbox(group_name=group, data=data)
+                for group, data in messages
+            ]
         )
-    send(
-        user=user,
-        data={
-            "type": "kafka.message",
-            "message": {
-                "message_type": message_type,
-                "notification_id": notification.id,
-                "data": data,
-            },
-        },
+        transaction.on_commit(schedule_notifications_outbox_drain)
+
+
+def schedule_notifications_outbox_drain() -> None:
+    """
+    one drain job is waiting at most, it delivers the messages of all the
+    transactions committed before its start, so the next ones are skipped
+    """
+    if cache.add(
+        NOTIFICATIONS_OUTBOX_DRAIN_KEY, True, NOTIFICATIONS_OUTBOX_DRAIN_TIMEOUT
+    ):
+        drain_notifications_outbox.delay()
+
+
+def delete_notifications(notifications: QuerySet[Notification]) -> int:
+    """
+    deletion of the notifications by one statement, the callers report
+    the deletion by one summary message instead of the message per row
+    """
+    deleted_count, _ = notifications.delete()
+    return deleted_count
+
+
+def increment_notifications_counters(user_ids: list[int]) -> dict[int, int]:
+    """
+    increment of the counters by the new notifications of the users,
+    returns the not read notifications counters of the users
+    """
+    counts: Counter[int] = Counter(user_ids)
+    if not counts:
+        return {}
+    NotificationsCounter.objects.bulk_create(
+        [NotificationsCounter(user_id=user_id) for user_id in sorted(counts)],
+        ignore_conflicts=True,
+    )
+    counters: QuerySet[NotificationsCounter] = NotificationsCounter.objects.filter(
+        user_id__in=counts
+    )
+    increment: Case = Case(
+        *(When(user_id=user_id, then=count) for user_id, count in counts.items()),
+        output_field=IntegerField(),
+    )
+    with transaction.atomic():
+        # the rows are locked in the order of the users, so the concurrent
+        # fan-outs to the same users wait for each other instead of a deadlock
+        list(counters.select_for_update().order_by("user_id").values_list("user_id"))
+        counters.update(
+            all_notifications_count=F("all_notifications_count") + increment,
+            not_read_notifications_count=F("not_read_notifications_count") + increment,
+        )
+    return dict(counters.values_list("user_id", "not_read_notifications_count"))
+
+
+def decrement_notifications_counter(
+    *, user_id: int, all_count: int = 0, not_read_count: int = 0
+) -> int:
+    """
+    decrement of the counters of the user by the read or deleted
+    notifications, returns the not read notifications counter
+    """
+    counters: QuerySet[NotificationsCounter] = NotificationsCounter.objects.filter(
+        user_id=user_id
+    )
+    counters.update(
+        all_notifications_count=Greatest(F("all_notifications_count") - all_count, 0),
+        not_read_notifications_count=Greatest(
+            F("not_read_notifications_count") - not_read_count, 0
+        ),
+    )
+    return counters.values_list("not_read_notifications_count", flat=True).first() or 0
+
+
+def update_notifications_counters(*, user_ids: list[int]) -> None:
+    """recalculation of the notifications counters of the users"""
+    NotificationsCounter.objects.bulk_create(
+        [NotificationsCounter(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    NotificationsCounter.objects.filter(user_id__in=user_ids).update(
+        all_notifications_count=notifications_count(Notification.objects.all()),
+        not_read_notifications_count=notifications_count(
+            Notification.objects.filter(type=Notification.Type.UNREAD)
+        ),
+    )
+
+
+def send_notifications_summary_message(
+    *,
+    user_id: int,
+    message_type: str,
+    data: dict[str, Any],
+    not_read_notifications_count: int,
+) -> None:
+    """one websocket message about the read or deleted notifications of the user"""
+    enqueue_messages(
+        [
+            (
+                User(id=user_id).group_name,
+                {
+                    "type": "kafka.message",
+                    "message": {
+                        "message_type": message_type,
+                        "notifications": data,
+                        "not_read_notifications_count": not_read_notifications_count,
+                    },
+                },
+            )
+        ]
+    )
+
+
+def send_to_users(notifications: list[Notification]) -> None:
+    """
+    bulk version of send_to_user: the notifications are created
+    and their messages are put to the outbox by one query each
+    """
+    for notification in notifications:
+        notification.set_references()
+    stored: list[Notification] = [
+        notification
+        for notification in notifications
+        if notification.message_type != CHANGE_MAINTENANCE_NOTIFICATION_TYPE
+    ]
+    Notification.objects.bulk_create(stored)
+    not_read_counts: dict[int, int] = increment_notifications_counters(
+        [notification.user_id for notification in stored]
+    )
+    enqueue_messages(
+        [
+            (
+                notification.user.group_name,
+                {
+                    "type": "kafka.message",
+                    "message": {
+                        "message_type": notification.message_type,
+                        "notification_id": notification.id,
+                        "data": notification.data,
+                        "not_read_notifications_count": not_read_counts.get(
+                            notification.user_id
+                        ),
+                    },
+                },
+            )
+            for notification in notifications
+        ]
+    )
+
+
+@app.task(
+    ignore_result=True,
+    time_limit=60,
+    soft_time_limit=55,
+    default_retry_delay=5,
+)
+def drain_notifications_outbox() -> None:
+    """
+    delivery of the outbox messages in batches. A batch is claimed by a short
+    transaction and sent without holding the row locks, it is removed only
+    after it was sent. The messages of a failed worker are claimed again
+    after the claim timeout, so every message is delivered at least once
+    """
+    # the messages committed from now on need the next drain job
+    cache.delete(NOTIFICATIONS_OUTBOX_DRAIN_KEY)
+    while True:
+        now: datetime = timezone.now()
+        with transaction.atomic():
+            messages: list[NotificationOutbox] = list(
+                NotificationOutbox.objects.select_for_update(skip_locked=True)
+                .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+                .order_by("id")[:NOTIFICATIONS_OUTBOX_BATCH_SIZE]
+            )
+            if not messages:
+                return
+            message_ids: list[int] = [message.id for message in messages]
+            NotificationOutbox.objects.filter(id__in=message_ids).update(
+                claimed_until=now + NOTIFICATIONS_OUTBOX_CLAIM_TIMEOUT
+            )
+        send_messages([(message.group_name, message.data) for message in messages])
+        NotificationOutbox.objects.filter(id__in=message_ids).delete()
+
+
+@app.task(
+    ignore_result=True,
+    time_limit=60,
+    soft_time_limit=55,
+    default_retry_delay=5,
+)
+def send_notifications_to_users(
+    *, message_type: str, notifications: list[tuple[int, dict[str, Any]]]
+) -> None:
+    """
+    creation and sending of the notifications of one type
+    for many users, by the (user id, data) pairs
+    """
+    send_to_users(
+        [
+            Notification(user=User(id=user_id), message_type=message_type, data=data)
+            for user_id, data in notifications
+        ]
     )
 
 
@@ -51,11 +294,27 @@ def send_to_user(
     default_retry_delay=5,
 )
 def read_all_user_notifications(*, request_user_id: int) -> None:
-    for notification in Notification.get_all().filter(
+    """
+    reading of all unread notifications of the user by one update
+    statement, reported by one "read up to the last id" message
+    """
+    notifications: QuerySet[Notification] = Notification.objects.filter(
         user_id=request_user_id, type=Notification.Type.UNREAD
-    ):
-        notification.type = notification.Type.READ
-        notification.save()
+    )
+    last_id: Optional[int] = notifications.aggregate(last_id=Max("id"))["last_id"]
+    if last_id is None:
+        return
+    read_count: int = notifications.filter(id__lte=last_id).update(
+        type=Notification.Type.READ
+    )
+    send_notifications_summary_message(
+        user_id=request_user_id,
+        message_type=NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+        data={"last_id": last_id},
+        not_read_notifications_count=decrement_notifications_counter(
+            user_id=request_user_id, not_read_count=read_count
+        ),
+    )
 
 
 @app.task(
@@ -65,4 +324,47 @@ def read_all_user_notifications(*, request_user_id: int) -> None:
     default_retry_delay=5,
 )
 def delete_all_user_notifications(*, request_user_id: int) -> None:
-    Notification.get_all().filter(user_id=request_user_id).delete()
+    """
+    deletion of all notifications of the user, reported
+    by one "deleted up to the last id" message
+    """
+    notifications: QuerySet[Notification] = Notification.objects.filter(
+        user_id=request_user_id
+    )
+    counts: dict[str, Optional[int]] = notifications.aggregate(
+        last_id=Max("id"),
+        not_read_count=Count("id", filter=Q(type=Notification.Type.UNREAD)),
+    )
+    if counts["last_id"] is None:
+        return
+    deleted_count: int = delete_notifications(
+        notifications.filter(id__lte=counts["last_id"])
+    )
+    send_notifications_summary_message(
+        user_id=request_user_id,
+        message_type=NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+        data={"last_id": counts["last_id"]},
+        not_read_notifications_count=decrement_notifications_counter(
+            user_id=request_user_id,
+            all_count=deleted_count,
+            not_read_count=counts["not_read_count"],
+        ),
+    )
+
+
+@app.task(
+    ignore_result=True,
+    time_limit=600,
+    soft_time_limit=590,
+    default_retry_delay=5,
+)
+def reconcile_notifications_counters() -> None:
+    """recalculation of the notifications counters of all users by batches"""
+    user_ids: list[int] = []
+    for user_id in User.objects.order_by("id").values_list("id", flat=True).iterator():
+        user_ids.append(user_id)
+        if len(user_ids) == NOTIFICATIONS_COUNTERS_BATCH_SIZE:
+            update_notifications_counters(user_ids=user_ids)
+            user_ids = []
+    if user_ids:
+        update_notifications_counters(user_ids=user_ids)
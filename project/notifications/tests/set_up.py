@@ -0,0 +1,29 @@
+from collections import OrderedDict
+
+from authentication.models import Profile, User
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase
+
+
+class SetUpNotificationsUser:
+    def setUp(self) -> OrderedDict:
+        self.user: User = User.objects.create(
+            email="user@example.com",
+            phone="+380683861969",
+            password="string11",
+            profile=Profile.objects.create(
+                name="John",
+                last_name="Jesus",
+                gender="Man",
+                birthday="2000-09-09",
+            ),
+        )
+        return super().setUp()
+
+
+class SetUpNotificationsTasks(SetUpNotificationsUser, APITestCase):
+    pass
+
+
+class SetUpNotificationsConsumers(SetUpNotificationsUser, TransactionTestCase):
+    """the consumers use the database from the other threads"""
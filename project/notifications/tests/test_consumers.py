@@ -0,0 +1,186 @@
+import asyncio
+import os
+from typing import Any
+from unittest import skipUnless
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from authentication.middlewares import (
+    JwtAuthMiddlewareStack,
+)
+from authentication.models import Profile, User
+from authentication.presence import connect_user
+from authentication.services import (
+    get_cached_user,
+)
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.test import override_settings
+from notifications.constant.notification_types import (
+    NOTIFICATIONS_REPLAYED_NOTIFICATION_TYPE,
+)
+from notifications.consumers import UserConsumer
+from notifications.models import Notification
+from notifications.routing import (
+    websocket_urlpatterns,
+)
+
+from .set_up import SetUpNotificationsConsumers
+
+LOAD_TEST_USERS: int = 20
+LOAD_TEST_CONNECTIONS: int = 2000
+LOAD_TESTS: bool = bool(os.environ.get("LOAD_TESTS"))
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class TestUserConsumer(SetUpNotificationsConsumers):
+    def test_connections_without_database_queries(self) -> None:
+        self.assert_connections_without_database_queries(LOAD_TEST_USERS)
+
+    @skipUnless(LOAD_TESTS, "the load tests are enabled by LOAD_TESTS=1")
+    def test_concurrent_connections_without_database_queries(self) -> None:
+        self.assert_connections_without_database_queries(LOAD_TEST_CONNECTIONS)
+
+    def assert_connections_without_database_queries(self, count: int) -> None:
+        cache.clear()
+        users: list[User] = [self.user] + [
+            User.objects.create(
+                email="user%s@example.com" % number,
+                phone="+38068386%04d" % number,
+                profile=Profile.objects.create(
+                    name="John", last_name="Jesus", gender="Man", birthday="2000-09-09"
+                ),
+            )
+            for number in range(1, LOAD_TEST_USERS)
+        ]
+        for user in users:
+            get_cached_user(user_id=user.id)
+            connect_user(user_id=user.id)
+        tokens: list[str] = [user.tokens()["access"] for user in users]
+        connections: list[tuple[User, str]] = [
+            (users[number % LOAD_TEST_USERS], tokens[number % LOAD_TEST_USERS])
+            for number in range(count)
+        ]
+        # the cached users and their presence spare the database on every handshake
+        with self.assertNumQueries(0):
+            received: list[dict[str, Any]] = async_to_sync(self.connect_many)(
+                connections
+            )
+        self.assertEqual(
+            [message["message"] for message in received],
+            [{"user_id": user.id} for user, _ in connections],
+        )
+
+    async def connect_many(
+        self, connections: list[tuple[User, str]]
+    ) -> list[dict[str, Any]]:
+        application = JwtAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+        communicators: list[WebsocketCommunicator] = [
+            WebsocketCommunicator(application, "/ws/notifications/?token=%s" % token)
+            for _, token in connections
+        ]
+        for connected, _ in await asyncio.gather(
+            *(communicator.connect(timeout=60) for communicator in communicators)
+        ):
+            self.assertTrue(connected)
+        await asyncio.gather(
+            *(
+                get_channel_layer().group_send(
+                    user.group_name,
+                    {"type": "kafka.message", "message": {"user_id": user.id}},
+                )
+                for user in {user.id: user for user, _ in connections}.values()
+            )
+        )
+        received: list[dict[str, Any]] = await asyncio.gather(
+            *(
+                communicator.receive_json_from(timeout=60)
+                for communicator in communicators
+            )
+        )
+        await asyncio.gather(
+            *(communicator.disconnect() for communicator in communicators)
+        )
+        return received
+
+    def test_presence_heartbeat_of_idle_connection(self) -> None:
+        with patch("notifications.consumers.PRESENCE_REFRESH_INTERVAL", 0.01), patch(
+            "notifications.consumers.refresh_user"
+        ) as refresh_user:
+            async_to_sync(self.connect_idle)()
+        refresh_user.assert_called_with(user_id=self.user.id)
+
+    async def connect_idle(self) -> None:
+        communicator = WebsocketCommunicator(
+            UserConsumer.as_asgi(), "/ws/notifications/"
+        )
+        communicator.scope["user"] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await asyncio.sleep(0.1)
+        await communicator.disconnect()
+
+    def test_replay_missed_notifications(self) -> None:
+        notification_ids: list[int] = [
+            notification.id
+            for notification in Notification.objects.bulk_create(
+                Notification(
+                    user=self.user, message_type="test", data={"number": number}
+                )
+                for number in range(3)
+            )
+        ]
+        messages: list[dict[str, Any]] = async_to_sync(self.reconnect)(
+            notification_ids[0]
+        )
+        self.assertEqual(
+            [message["message"] for message in messages],
+            [
+                {
+                    "message_type": "test",
+                    "notification_id": notification_ids[1],
+                    "data": {"number": 1},
+                },
+                {
+                    "message_type": "test",
+                    "notification_id": notification_ids[2],
+                    "data": {"number": 2},
+                },
+                {
+                    "message_type": NOTIFICATIONS_REPLAYED_NOTIFICATION_TYPE,
+                    "last_notification_id": notification_ids[2],
+                    "complete": True,
+                },
+                {"notification_id": notification_ids[2] + 1},
+            ],
+        )
+
+    async def reconnect(self, last_notification_id: int) -> list[dict[str, Any]]:
+        communicator = WebsocketCommunicator(
+            UserConsumer.as_asgi(),
+            "/ws/notifications/?last_notification_id=%s" % last_notification_id,
+        )
+        communicator.scope["user"] = self.user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        messages: list[dict[str, Any]] = [
+            await communicator.receive_json_from() for _ in range(3)
+        ]
+        replayed_notification_id: int = messages[1]["message"]["notification_id"]
+        # the live message of the replayed notification is not sent again
+        for notification_id in (replayed_notification_id, replayed_notification_id + 1):
+            await get_channel_layer().group_send(
+                self.user.group_name,
+                {
+                    "type": "kafka.message",
+                    "message": {"notification_id": notification_id},
+                },
+            )
+        messages.append(await communicator.receive_json_from())
+        self.assertTrue(await communicator.receive_nothing())
+        await communicator.disconnect()
+        return messages
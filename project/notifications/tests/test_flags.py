@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from notifications import flags
+from rest_framework.status import HTTP_200_OK
+
+from .set_up import SetUpNotificationsTasks
+
+
+class TestRuntimeFlags(SetUpNotificationsTasks):
+    def setUp(self) -> None:
+        cache.clear()
+        config_dir: str = tempfile.mkdtemp()
+        self.config_file_path: str = os.path.join(config_dir, "config.json")
+        with open(self.config_file_path, "w") as f:
+            json.dump({"isMaintenance": False, "version": "1.0.0"}, f)
+        os.chmod(self.config_file_path, 0o644)
+        patcher = mock.patch.object(flags, "CONFIG_FILE_PATH", self.config_file_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        flags.load_config.cache_clear()
+        self.addCleanup(flags.load_config.cache_clear)
+        flags.reset_runtime_flags()
+        self.addCleanup(flags.reset_runtime_flags)
+        return super().setUp()
+
+    def test_get_maintenance_and_version_without_reading_config(self) -> None:
+        response = self.client.get(reverse("get-maintenance"))
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.data, {"isMaintenance": False})
+
+        with mock.patch("builtins.open") as open_file, mock.patch.object(
+            cache, "get_many"
+        ) as get_many:
+            for _ in range(10):
+                self.assertEqual(
+                    self.client.get(reverse("get-maintenance")).data,
+                    {"isMaintenance": False},
+                )
+                self.assertEqual(
+                    self.client.get(reverse("get-current-version")).data,
+                    {"version": "1.0.0"},
+                )
+        open_file.assert_not_called()
+        get_many.assert_not_called()
+
+    def test_change_maintenance_is_seen_by_other_workers(self) -> None:
+        self.assertFalse(flags.get_runtime_flags()["isMaintenance"])
+
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("change-maintenance"), {"isMaintenance": True}
+        )
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertTrue(flags.get_runtime_flags()["isMaintenance"])
+        with open(self.config_file_path) as f:
+            self.assertEqual(json.load(f), {"isMaintenance": True, "version": "1.0.0"})
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.config_file_path)), ["config.json"]
+        )
+        self.assertEqual(os.stat(self.config_file_path).st_mode & 0o777, 0o644)
+        self.assertTrue(flags.load_config()["isMaintenance"])
+
+        # the flag changed by the other worker
+        cache.set(flags.runtime_flag_key("isMaintenance"), False, None)
+        self.assertTrue(flags.get_runtime_flags()["isMaintenance"])
+        with mock.patch.object(flags.time, "monotonic", return_value=10**9):
+            self.assertFalse(flags.get_runtime_flags()["isMaintenance"])
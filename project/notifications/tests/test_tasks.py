@@ -0,0 +1,251 @@
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from authentication.models import Profile, User
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+)
+from django.utils import timezone
+from freezegun import freeze_time
+from notifications.constant.notification_types import (
+    NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+    NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+)
+from notifications.models import (
+    Notification,
+    NotificationOutbox,
+    NotificationsCounter,
+)
+from notifications.services import (
+    bulk_delete_notifications,
+)
+from notifications.tasks import (
+    NOTIFICATIONS_OUTBOX_CLAIM_TIMEOUT,
+    delete_all_user_notifications,
+    drain_notifications_outbox,
+    increment_notifications_counters,
+    read_all_user_notifications,
+    reconcile_notifications_counters,
+    schedule_notifications_outbox_drain,
+    send_to_user,
+)
+
+from .set_up import SetUpNotificationsTasks
+
+
+class TestNotificationsTasks(SetUpNotificationsTasks):
+    def test_send_to_user_delivers_after_commit(self) -> None:
+        channel_layer = get_channel_layer()
+        channel_name: str = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(self.user.group_name, channel_name)
+        with self.captureOnCommitCallbacks() as callbacks:
+            send_to_user(self.user, message_type="test", data={"test": True})
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        drain_notifications_outbox()
+        self.assertEqual(NotificationOutbox.objects.count(), 0)
+        message = async_to_sync(channel_layer.receive)(channel_name)
+        self.assertEqual(
+            message["message"]["notification_id"], Notification.objects.get().id
+        )
+
+    def test_send_to_users_schedules_one_drain(self) -> None:
+        cache.clear()
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                send_to_user(self.user, message_type="test", data={"test": True})
+            send_to_user(self.user, message_type="test", data={"test": True})
+        with patch.object(drain_notifications_outbox, "delay") as delay:
+            for callback in callbacks:
+                callback()
+            delay.assert_called_once()
+            # the started drain job lets the next commit schedule another one
+            drain_notifications_outbox()
+            schedule_notifications_outbox_drain()
+        self.assertEqual(delay.call_count, 2)
+
+    def test_drain_skips_claimed_messages(self) -> None:
+        send_to_user(self.user, message_type="test", data={"test": True})
+        NotificationOutbox.objects.update(
+            claimed_until=timezone.now() + timezone.timedelta(minutes=1)
+        )
+        drain_notifications_outbox()
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        with freeze_time(timezone.now() + NOTIFICATIONS_OUTBOX_CLAIM_TIMEOUT):
+            drain_notifications_outbox()
+        self.assertEqual(NotificationOutbox.objects.count(), 0)
+
+    def test_send_to_user_rolled_back(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    send_to_user(self.user, message_type="test", data={"test": True})
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(NotificationOutbox.objects.count(), 0)
+        self.assertEqual(Notification.objects.count(), 0)
+
+    def test_send_to_user_fills_references(self) -> None:
+        send_to_user(
+            self.user,
+            message_type="test",
+            data={"event": {"id": 5}, "invite": {"id": 7}},
+        )
+        send_to_user(self.user, message_type="test", data={"test": True})
+        self.assertEqual(
+            list(
+                Notification.objects.order_by("id").values_list("event_id", "invite_id")
+            ),
+            [(5, 7), (None, None)],
+        )
+
+    def test_backfill_notifications_references(self) -> None:
+        Notification.objects.bulk_create(
+            [
+                Notification(user=self.user, message_type="test", data=data)
+                for data in ({"event": {"id": 5}}, {"invite": {"id": 7}}, {})
+            ]
+        )
+        call_command(
+            "backfill_notifications_references", "--batch-size=2", stdout=StringIO()
+        )
+        self.assertEqual(
+            list(
+                Notification.objects.order_by("id").values_list("event_id", "invite_id")
+            ),
+            [(5, None), (None, 7), (None, None)],
+        )
+
+    def test_read_all_user_notifications(self) -> None:
+        notifications: list[Notification] = self.create_notifications(3)
+        with self.assertNumQueries(5):
+            read_all_user_notifications(request_user_id=self.user.id)
+        self.assertFalse(
+            Notification.objects.filter(type=Notification.Type.UNREAD).exists()
+        )
+        self.assertEqual(
+            NotificationOutbox.objects.get().data["message"],
+            {
+                "message_type": NOTIFICATIONS_READ_NOTIFICATION_TYPE,
+                "notifications": {"last_id": notifications[-1].id},
+                "not_read_notifications_count": 0,
+            },
+        )
+
+    def test_delete_all_user_notifications(self) -> None:
+        notifications: list[Notification] = self.create_notifications(3)
+        with self.assertNumQueries(5):
+            delete_all_user_notifications(request_user_id=self.user.id)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(
+            NotificationOutbox.objects.get().data["message"],
+            {
+                "message_type": NOTIFICATIONS_DELETE_NOTIFICATION_TYPE,
+                "notifications": {"last_id": notifications[-1].id},
+                "not_read_notifications_count": 0,
+            },
+        )
+
+    def test_bulk_delete_notifications(self) -> None:
+        notifications: list[Notification] = self.create_notifications(3)
+        ids: list[int] = [notifications[2].id, notifications[0].id, 0]
+        self.assertEqual(
+            list(
+                bulk_delete_notifications(
+                    data=ids, queryset=Notification.get_all(), user=self.user
+                )
+            ),
+            [{"success": ids[0]}, {"success": ids[1]}],
+        )
+        self.assertEqual(
+            list(Notification.objects.values_list("id", flat=True)),
+            [notifications[1].id],
+        )
+        self.assertEqual(
+            NotificationOutbox.objects.get().data["message"]["notifications"],
+            {"ids": sorted(ids[:2])},
+        )
+
+    def test_bulk_delete_notifications_sends_one_message(self) -> None:
+        notifications: list[Notification] = self.create_notifications(10)
+        with patch.object(get_channel_layer(), "group_send") as group_send:
+            list(
+                bulk_delete_notifications(
+                    data=[notification.id for notification in notifications[:5]],
+                    queryset=Notification.get_all(),
+                    user=self.user,
+                )
+            )
+            delete_all_user_notifications(request_user_id=self.user.id)
+        group_send.assert_not_called()
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(
+            [
+                message.data["message"]["message_type"]
+                for message in NotificationOutbox.objects.order_by("id")
+            ],
+            [NOTIFICATIONS_DELETE_NOTIFICATION_TYPE] * 2,
+        )
+
+    def test_notifications_counters(self) -> None:
+        send_to_user(self.user, message_type="test", data={"test": True})
+        send_to_user(self.user, message_type="test", data={"test": True})
+        self.assertEqual(
+            NotificationOutbox.objects.last().data["message"][
+                "not_read_notifications_count"
+            ],
+            2,
+        )
+        read_all_user_notifications(request_user_id=self.user.id)
+        send_to_user(self.user, message_type="test", data={"test": True})
+        counter: NotificationsCounter = NotificationsCounter.objects.get(user=self.user)
+        self.assertEqual(
+            (counter.all_notifications_count, counter.not_read_notifications_count),
+            (3, 1),
+        )
+        NotificationsCounter.objects.update(
+            all_notifications_count=10, not_read_notifications_count=10
+        )
+        reconcile_notifications_counters()
+        counter.refresh_from_db()
+        self.assertEqual(
+            (counter.all_notifications_count, counter.not_read_notifications_count),
+            (3, 1),
+        )
+
+    def test_increment_notifications_counters_by_one_update(self) -> None:
+        user: User = User.objects.create(
+            email="user2@example.com",
+            phone="+380683861970",
+            profile=Profile.objects.create(
+                name="John", last_name="Jesus", gender="Man", birthday="2000-09-09"
+            ),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            counters: dict[int, int] = increment_notifications_counters(
+                [user.id, self.user.id, user.id]
+            )
+        self.assertEqual(counters, {self.user.id: 1, user.id: 2})
+        self.assertEqual(
+            len(
+                [
+                    query
+                    for query in queries.captured_queries
+                    if query["sql"].startswith("UPDATE")
+                ]
+            ),
+            1,
+        )
+
+    def create_notifications(self, count: int) -> list[Notification]:
+        return Notification.objects.bulk_create(
+            Notification(user=self.user, message_type="test", data={})
+            for _ in range(count)
+        )
@@ -1,7 +1,9 @@
-import json
-from typing import Any, Type
+from typing import Any, Optional, Type
 
-from config.yasg import skip_param
+from config.pagination import (
+    CustomCursorPagination,
+)
+from config.yasg import cursor_param, skip_param
 from django.db.models.query import QuerySet
 from django.utils.decorators import (
     method_decorator,
@@ -19,7 +21,11 @@ from notifications.constant.success import (
     NOTIFICATIONS_DELETED_SUCCESS,
     NOTIFICATIONS_READED_SUCCESS,
 )
-from notifications.models import Notification
+from notifications.flags import get_runtime_flags
+from notifications.models import (
+    Notification,
+    NotificationsCounter,
+)
 from notifications.serializers import (
     ChangeMaintenanceSerializer,
     NotificationSerializer,
@@ -62,8 +68,12 @@ class NotificationsList(ListAPIView):
     queryset: QuerySet[Notification] = Notification.get_all()
 
 
-@method_decorator(swagger_auto_schema(manual_parameters=[skip_param]), name="get")
+@method_decorator(
+    swagger_auto_schema(manual_parameters=[skip_param, cursor_param]), name="get"
+)
 class UserNotificationsList(NotificationsList):
+    pagination_class = CustomCursorPagination
+
     @skip_objects_from_response_by_id
     def get_queryset(self) -> QuerySet[Notification]:
         return self.queryset.filter(user_id=self.request.user.id)
@@ -74,14 +84,11 @@ class UserNotificaitonsCount(GenericAPIView):
     serializer_class: Type[Serializer] = UserNotificationsCount
 
     def get(self, request: Request) -> Response:
-        data: dict[str, int] = {
-            "all_notifications_count": self.queryset.filter(
-                user_id=self.request.user.id
-            ).count(),
-            "not_read_notifications_count": self.queryset.filter(
-                type=Notification.Type.UNREAD, user_id=self.request.user.id
-            ).count(),
-        }
+        data: Optional[dict[str, int]] = (
+            NotificationsCounter.objects.filter(user_id=self.request.user.id)
+            .values("all_notifications_count", "not_read_notifications_count")
+            .first()
+        ) or {"all_notifications_count": 0, "not_read_notifications_count": 0}
         serializer = self.serializer_class(data=data)
         serializer.is_valid(raise_exception=True)
         return Response(serializer.data)
@@ -96,7 +103,9 @@ class ReadNotifications(GenericAPIView):
         serializer.is_valid(raise_exception=True)
         return Response(
             bulk_read_notifications(
-                data=serializer.validated_data["ids"], queryset=self.queryset
+                data=serializer.validated_data["ids"],
+                queryset=self.queryset,
+                user=request.user,
             ),
             status=HTTP_200_OK,
         )
@@ -140,9 +149,9 @@ class GetMaintenance(APIView):
 
     def get(self, request: Request) -> Response:
         try:
-            with open("./config/config.json", "r") as f:
-                data = f.read()
-            return Response({self.key: json.loads(data)[self.key]}, status=HTTP_200_OK)
+            return Response(
+                {self.key: get_runtime_flags()[self.key]}, status=HTTP_200_OK
+            )
         except:
             return Response(CONFIG_FILE_ERROR, status=HTTP_400_BAD_REQUEST)
 